@@ -0,0 +1,143 @@
+"""Adaptive worker count for --workers auto."""
+
+import os
+import time
+from typing import Optional, Tuple
+
+from .config import AutoscaleConfig
+from .logger import StructuredLogger
+from .pool import SupervisedPool
+
+# Relative throughput gain that justifies another worker
+_MIN_GAIN = 0.05
+
+
+def _read_cpu_times() -> Optional[Tuple[int, int]]:
+    """Return (busy, total) jiffies for all CPUs from /proc/stat."""
+    try:
+        with open('/proc/stat', 'r') as f:
+            fields = [int(value) for value in f.readline().split()[1:]]
+    except (OSError, ValueError):
+        return None
+
+    # idle + iowait count as not busy
+    idle = fields[3] + (fields[4] if len(fields) > 4 else 0)
+    total = sum(fields)
+    return total - idle, total
+
+
+def _total_memory_mb() -> Optional[float]:
+    """Physical memory of the host in megabytes."""
+    try:
+        return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def resolve_max_workers(config: AutoscaleConfig) -> int:
+    """Upper bound on workers for --workers auto."""
+    return config.max_workers or min(16, os.cpu_count() or 1)
+
+
+class WorkerAutoscaler:
+    """
+    Grows the pool while pages/sec keeps rising and shrinks it under pressure.
+
+    The processor reports converted pages with record_pages() and calls
+    maybe_scale() from its result loop; a decision is taken once per
+    autoscale.interval_sec and written to the structured log.
+    """
+
+    def __init__(self, pool: SupervisedPool, config: AutoscaleConfig, logger: StructuredLogger):
+        self.pool = pool
+        self.config = config
+        self.logger = logger
+
+        self.max_workers = resolve_max_workers(config)
+        if config.memory_budget_mb:
+            self.memory_budget_mb = config.memory_budget_mb
+        else:
+            total_memory = _total_memory_mb()
+            self.memory_budget_mb = total_memory * 0.8 if total_memory else None
+
+        self._pages = 0
+        self._previous_throughput: Optional[float] = None
+        self._interval_start = time.monotonic()
+        self._cpu_start = _read_cpu_times()
+
+    def record_pages(self, pages: int) -> None:
+        """Count pages converted in the current interval."""
+        self._pages += pages
+
+    def maybe_scale(self) -> None:
+        """Take a scaling decision if the current interval has elapsed."""
+        now = time.monotonic()
+        elapsed = now - self._interval_start
+        if elapsed < self.config.interval_sec:
+            return
+
+        throughput = self._pages / elapsed
+        cpu_busy = self._cpu_busy_fraction()
+        rss_mb = self.pool.total_rss_mb()
+        workers = self.pool.size
+
+        action, reason = self._decide(throughput, cpu_busy, rss_mb, workers)
+        if action == 'scale_up':
+            self.pool.resize(workers + 1)
+        elif action == 'scale_down':
+            self.pool.resize(workers - 1)
+
+        self.logger.log_info(
+            "Autoscale decision",
+            action=action,
+            reason=reason,
+            workers=workers,
+            target_workers=self.pool.size,
+            pages_per_sec=round(throughput, 2),
+            cpu_busy=round(cpu_busy, 2) if cpu_busy is not None else None,
+            rss_mb=round(rss_mb, 1),
+            memory_budget_mb=round(self.memory_budget_mb, 1) if self.memory_budget_mb else None
+        )
+
+        self._previous_throughput = throughput
+        self._pages = 0
+        self._interval_start = now
+
+    def _decide(self, throughput: float, cpu_busy: Optional[float], rss_mb: float, workers: int) -> Tuple[str, str]:
+        """Return (action, reason) for the interval that just ended."""
+        budget = self.memory_budget_mb
+        saturation = self.config.cpu_saturation
+        previous = self._previous_throughput
+        improved = previous is None or throughput > previous * (1 + _MIN_GAIN)
+        declined = previous is not None and throughput < previous * (1 - _MIN_GAIN)
+
+        # Back off first: memory pressure, or a saturated CPU losing throughput
+        if budget and rss_mb >= budget * 0.9 and workers > 1:
+            return 'scale_down', 'memory_pressure'
+        if cpu_busy is not None and cpu_busy >= saturation and declined and workers > 1:
+            return 'scale_down', 'cpu_saturated'
+
+        if workers >= self.max_workers:
+            return 'hold', 'max_workers'
+        if not improved:
+            return 'hold', 'throughput_flat'
+        if cpu_busy is not None and cpu_busy >= saturation:
+            return 'hold', 'cpu_saturated'
+        if budget and rss_mb + rss_mb / max(workers, 1) >= budget * 0.9:
+            return 'hold', 'memory_headroom'
+
+        return 'scale_up', 'throughput_rising'
+
+    def _cpu_busy_fraction(self) -> Optional[float]:
+        """Host CPU utilisation since the previous decision, from 0 to 1."""
+        current = _read_cpu_times()
+        start, self._cpu_start = self._cpu_start, current
+
+        if current and start and current[1] > start[1]:
+            return (current[0] - start[0]) / (current[1] - start[1])
+
+        # No procfs: approximate with the load average
+        try:
+            return min(1.0, os.getloadavg()[0] / (os.cpu_count() or 1))
+        except (OSError, AttributeError):
+            return None
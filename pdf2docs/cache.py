@@ -0,0 +1,143 @@
+"""Content-addressed cache of converted outputs."""
+
+import hashlib
+import json
+import threading
+import time
+import zlib
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from . import __version__
+from .config import Config
+from .converter import docling_version
+from .store import open_database
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    content BLOB NOT NULL,
+    result_info TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+"""
+
+
+def content_hash(file_path: Path) -> str:
+    """BLAKE2b digest of the file contents."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def pipeline_fingerprint(config: Config) -> str:
+    """Digest of everything besides the PDF that shapes the output."""
+    settings = {
+        'pdf2docs': __version__,
+        'docling': docling_version(),
+        'backend': config.docling.backend,
+        'routing': asdict(config.routing),
+        'serialization': asdict(config.serialization),
+        'max_pages': config.limits.max_pages if config.limits.truncate_to_max_pages else 0
+    }
+    return hashlib.blake2b(json.dumps(settings, sort_keys=True).encode('utf-8'), digest_size=20).hexdigest()
+
+
+class ConversionCache:
+    """
+    Stores converted content by PDF content hash, pipeline fingerprint and output format.
+
+    The same PDF under another name or language folder is served from the
+    cache instead of being converted again. Entries are kept in a SQLite
+    database, compressed, and the least recently used ones are evicted once
+    the total size passes max_size_mb.
+    """
+
+    def __init__(self, db_path: Path, config: Config, max_size_mb: int):
+        self.db_path = db_path
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self._fingerprint = pipeline_fingerprint(config)
+
+        # Used from the pipeline's lookup and writer threads
+        self._conn = open_database(db_path, _SCHEMA, check_same_thread=False)
+
+        self._lock = threading.Lock()
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def keys_for(self, file_hash: str, output_exts: Iterable[str]) -> Dict[str, str]:
+        """Cache key of each output format of a file with the given content hash."""
+        return {
+            output_ext: hashlib.blake2b(
+                f"{file_hash}:{self._fingerprint}:{output_ext}".encode('utf-8'),
+                digest_size=20
+            ).hexdigest()
+            for output_ext in output_exts
+        }
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Return (content, result_info) for a key, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute("SELECT content, result_info FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+
+            self._hits += 1
+            self._conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+        content, result_info = row
+        return zlib.decompress(content).decode('utf-8'), json.loads(result_info)
+
+    def put(self, key: str, content: str, result_info: Dict[str, Any]) -> None:
+        """Store a successful conversion, evicting old entries beyond the size cap."""
+        data = zlib.compress(content.encode('utf-8'))
+        info = json.dumps({k: v for k, v in result_info.items() if k != 'content'})
+        size = len(data) + len(info)
+        if size > self.max_size_bytes:
+            return
+
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, content, result_info, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, data, info, size, time.time())
+            )
+            self._size += size - (previous[0] if previous else 0)
+            self._evict()
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'size_mb': round(self._size / (1024 * 1024), 1)
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits its cap."""
+        while self._size > self.max_size_bytes:
+            row = self._conn.execute("SELECT key, size FROM entries ORDER BY last_used LIMIT 1").fetchone()
+            if row is None:
+                break
+
+            self._conn.execute("DELETE FROM entries WHERE key = ?", row[:1])
+            self._size -= row[1]
+            self._evictions += 1
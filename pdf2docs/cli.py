@@ -1,26 +1,83 @@
 """CLI interface for PDF2Docs using Click."""
 
 import click
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
+from . import __version__
 from .config import ConfigManager
-from .processor import PDFProcessor
 from .utils import validate_language_code
 
+# The processor and server are imported by the commands that run them, so
+# --help, --version and usage errors do not load the conversion stack
 
-@click.command()
+
+class WorkersParamType(click.ParamType):
+    """Worker count from 1 to 16, or 'auto' for adaptive scaling."""
+
+    name = 'workers'
+
+    def convert(self, value, param, ctx):
+        if value == 'auto' or isinstance(value, int):
+            return value
+
+        try:
+            workers = int(value)
+        except ValueError:
+            self.fail(f"{value!r} is not an integer or 'auto'", param, ctx)
+
+        if not 1 <= workers <= 16:
+            self.fail(f"{workers} is not in the range 1-16", param, ctx)
+
+        return workers
+
+
+class OutputExtParamType(click.ParamType):
+    """One output format, txt or md, or several separated by commas such as 'txt,md'."""
+
+    name = 'out_ext'
+
+    def convert(self, value, param, ctx):
+        exts = []
+        for ext in value.split(','):
+            ext = ext.strip().lower()
+            if ext not in ('txt', 'md'):
+                self.fail(f"{ext!r} is not one of 'txt', 'md'", param, ctx)
+            if ext not in exts:
+                exts.append(ext)
+
+        return ','.join(exts)
+
+
+class DefaultCommandGroup(click.Group):
+    """Command group that runs 'convert' when no command is named."""
+
+    def parse_args(self, ctx, args):
+        if not args or (args[0] not in self.commands and args[0] not in ('--help', '--version')):
+            args = ['convert'] + list(args)
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=DefaultCommandGroup)
+@click.version_option(version=__version__, prog_name='pdf2docs')
+def main():
+    """Convert PDF files to text or markdown using Docling.
+
+    Runs the convert command unless another command is named.
+    """
+
+
+@main.command()
 @click.option(
     '--input', 'input_path',
     type=click.Path(exists=True, path_type=Path),
-    required=True,
-    help='Input PDF file or directory (data/raw/es or data/raw/en)'
+    help='Input PDF file or directory (data/raw/es, data/raw/en, or data/raw for all languages)'
 )
 @click.option(
     '--out-ext',
-    type=click.Choice(['txt', 'md']),
-    required=True,
-    help='Output file extension (txt or md)'
+    type=OutputExtParamType(),
+    help='Output file extension (txt or md), or several from one conversion (txt,md)'
 )
 @click.option(
     '--lang',
@@ -31,10 +88,25 @@ from .utils import validate_language_code
     '--pattern',
     help='Glob pattern to filter files'
 )
+@click.option(
+    '--recursive',
+    is_flag=True,
+    help='Also convert PDFs in subfolders, into the same subfolders of the results'
+)
 @click.option(
     '--workers',
-    type=click.IntRange(1, 16),
-    help='Number of parallel workers (1-16)'
+    type=WorkersParamType(),
+    help='Number of parallel workers (1-16), or "auto" to scale with throughput'
+)
+@click.option(
+    '--executor',
+    type=click.Choice(['thread', 'process']),
+    help='Worker type: threads in one process or separate worker processes'
+)
+@click.option(
+    '--schedule',
+    type=click.Choice(['fifo', 'ljf', 'sjf']),
+    help='File order: discovery order, longest job first or shortest job first'
 )
 @click.option(
     '--backend',
@@ -65,25 +137,42 @@ from .utils import validate_language_code
     is_flag=True,
     help='Stop processing on first error'
 )
-@click.version_option()
-def main(
-    input_path: Path,
-    out_ext: str,
+@click.option(
+    '--resume',
+    is_flag=True,
+    help='Restart the unfinished files recorded in the run journal'
+)
+@click.option(
+    '--reexport',
+    is_flag=True,
+    help='Regenerate outputs from saved DoclingDocuments without converting again'
+)
+def convert(
+    input_path: Optional[Path] = None,
+    out_ext: Optional[str] = None,
     lang: Optional[str] = None,
     pattern: Optional[str] = None,
-    workers: Optional[int] = None,
+    recursive: bool = False,
+    workers: Optional[Union[int, str]] = None,
+    executor: Optional[str] = None,
+    schedule: Optional[str] = None,
     backend: Optional[str] = None,
     config: Optional[Path] = None,
     log_file: Optional[Path] = None,
     quiet: bool = False,
     no_progress: bool = False,
-    fail_fast: bool = False
+    fail_fast: bool = False,
+    resume: bool = False,
+    reexport: bool = False
 ):
     """Convert PDF files to text or markdown using Docling.
 
     Converts PDFs from data/raw/{es,en} to data/result/{es,en} with
     automatic language detection and skip logic for existing files.
     """
+    if not resume and (input_path is None or out_ext is None):
+        raise click.UsageError("--input and --out-ext are required unless --resume is given.")
+
     try:
         # Combine quiet flags
         is_quiet = quiet or no_progress
@@ -94,10 +183,13 @@ def main(
         # Build args dict for config override
         args = {
             'workers': workers,
+            'executor': executor,
+            'schedule': schedule,
             'quiet': is_quiet,
             'fail_fast': fail_fast,
             'log_file': str(log_file) if log_file else None,
-            'backend': backend
+            'backend': backend,
+            'reexport': reexport
         }
 
         # Override config with CLI args
@@ -108,16 +200,26 @@ def main(
             raise click.BadParameter(f"Invalid language code: {lang}. Must be 'es' or 'en'.")
 
         # Create processor and run
+        from .processor import PDFProcessor
+
         processor = PDFProcessor(app_config)
-        success = processor.process(
-            input_path=input_path,
-            output_ext=out_ext,
-            language_override=lang,
-            pattern=pattern
-        )
-
-        # Exit with appropriate code
-        if not success:
+        if resume:
+            success = processor.resume()
+        else:
+            success = processor.process(
+                input_path=input_path,
+                output_ext=out_ext,
+                language_override=lang,
+                pattern=pattern,
+                reexport=reexport,
+                recursive=recursive
+            )
+
+        # Exit with appropriate code; 130 is the shell's status for Ctrl-C
+        if processor.interrupted:
+            click.echo("Processing interrupted. Run with --resume to finish the remaining files.", err=True)
+            sys.exit(130)
+        elif not success:
             click.echo("Processing completed with errors. Check logs for details.", err=True)
             raise click.Abort()
         else:
@@ -128,5 +230,80 @@ def main(
         raise click.Abort()
 
 
+@main.command()
+@click.option(
+    '--host',
+    help='Address to listen on (default: 127.0.0.1)'
+)
+@click.option(
+    '--port',
+    type=click.IntRange(0, 65535),
+    help='TCP port to listen on (default: 8080)'
+)
+@click.option(
+    '--socket', 'socket_path',
+    help='Listen on this Unix socket instead of host:port'
+)
+@click.option(
+    '--workers',
+    type=WorkersParamType(),
+    help='Number of warm workers converting at once (1-16)'
+)
+@click.option(
+    '--executor',
+    type=click.Choice(['thread', 'process']),
+    help='Worker type: threads in one process or separate worker processes'
+)
+@click.option(
+    '--max-queue',
+    type=click.IntRange(min=0),
+    help='Requests waiting for a worker before new ones are rejected'
+)
+@click.option(
+    '--config',
+    type=click.Path(exists=True, path_type=Path),
+    help='Path to configuration YAML file'
+)
+@click.option(
+    '--log-file',
+    type=click.Path(path_type=Path),
+    help='Path to log file'
+)
+def serve(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    socket_path: Optional[str] = None,
+    workers: Optional[Union[int, str]] = None,
+    executor: Optional[str] = None,
+    max_queue: Optional[int] = None,
+    config: Optional[Path] = None,
+    log_file: Optional[Path] = None
+):
+    """Serve conversions over HTTP, keeping the converters loaded.
+
+    POST a PDF to /convert, or JSON with the path of a local PDF, and get the
+    content and result_info back as JSON.
+    """
+    try:
+        config_manager = ConfigManager(config) if config else ConfigManager.from_default_locations()
+        app_config = config_manager.override_with_args({
+            'workers': workers,
+            'executor': executor,
+            'log_file': str(log_file) if log_file else None,
+            'host': host,
+            'port': port,
+            'socket_path': socket_path,
+            'max_queue': max_queue
+        })
+
+        from .server import ConversionServer
+
+        ConversionServer(app_config).serve_forever()
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
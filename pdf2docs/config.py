@@ -2,16 +2,21 @@
 
 import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 from dataclasses import dataclass, field
 
 
 @dataclass
 class LimitsConfig:
     max_file_size_mb: int = 10
-    max_pages: int = 500
+    max_pages: int = 500  # 0 = unlimited
+    truncate_to_max_pages: bool = False  # convert the first max_pages pages of longer PDFs instead of skipping them
     timeout_per_file_sec: int = 120
     timeout_strategy: str = "per_file"
+    drain_timeout_sec: int = 30  # time in-flight files get to finish after SIGINT/SIGTERM
+    max_files_per_worker: int = 0  # 0 = unlimited (process executor only)
+    max_worker_rss_mb: int = 0  # 0 = unlimited (process executor only)
+    text_probe_pages: int = 5  # pages sampled for a text layer before conversion (0 = no probe)
 
 
 @dataclass
@@ -26,12 +31,80 @@ class LoggingConfig:
     log_file: Optional[str] = None
     progress: bool = True
     fail_fast: bool = False
-    workers: int = 4
+    workers: Union[int, str] = 4  # 1-16 or "auto"
+    executor: str = "thread"  # thread|process
+    schedule: str = "fifo"  # fifo|ljf|sjf
 
 
 @dataclass
 class DoclingConfig:
     backend: str = "auto"
+    page_shard_threshold: int = 0  # shard PDFs with more pages than this (0 = never)
+    page_shard_size: int = 50
+    converter_instances: int = 0  # converters shared by thread workers (0 = one per thread)
+    batch_size: int = 1  # files per convert_all call on a worker (1 = convert files one by one)
+    doc_batch_size: int = 0  # docling settings.perf.doc_batch_size (0 = docling default)
+    page_batch_size: int = 0  # docling settings.perf.page_batch_size (0 = docling default)
+
+
+@dataclass
+class RoutingConfig:
+    fast_path: bool = False  # send simple text-only PDFs to the text-layer extractor instead of Docling
+    min_chars_per_page: int = 200  # less text than this goes to Docling
+    max_paths_per_page: int = 10  # vector paths suggest ruled tables or drawings
+    max_images_per_page: int = 0
+    max_columns: int = 1
+
+
+@dataclass
+class AutoscaleConfig:
+    min_workers: int = 2
+    max_workers: int = 0  # 0 = min(16, CPU count)
+    interval_sec: float = 15.0
+    memory_budget_mb: int = 0  # 0 = 80% of physical memory
+    cpu_saturation: float = 0.95
+
+
+@dataclass
+class PipelineConfig:
+    postprocess_workers: int = 2  # threads for table conversion and text normalization
+    write_workers: int = 2  # threads writing output files
+    queue_size: int = 0  # files waiting between stages (0 = 2x workers)
+
+
+@dataclass
+class JournalConfig:
+    enabled: bool = True
+    path: str = "data/journal.db"
+    max_attempts: int = 3  # failed files are retried by --resume until this many attempts
+
+
+@dataclass
+class ManifestConfig:
+    enabled: bool = True
+    path: str = "data/manifest.db"
+
+
+@dataclass
+class CacheConfig:
+    enabled: bool = False  # reads every input in full and keeps a copy of every output
+    path: str = "data/cache.db"
+    max_size_mb: int = 1024  # least recently used outputs are evicted beyond this
+
+
+@dataclass
+class DocumentsConfig:
+    enabled: bool = False  # save each DoclingDocument so other formats can be exported without reconverting
+    dir: str = ""  # where to save them (empty = next to the outputs in data/result)
+
+
+@dataclass
+class ServerConfig:
+    host: str = "127.0.0.1"
+    port: int = 8080
+    socket_path: str = ""  # listen on this Unix socket instead of host:port
+    max_concurrency: int = 0  # conversions at once (0 = logging.workers)
+    max_queue: int = 16  # requests waiting for a worker before 503
 
 
 @dataclass
@@ -40,6 +113,14 @@ class Config:
     serialization: SerializationConfig = field(default_factory=SerializationConfig)
     logging: LoggingConfig = field(default_factory=LoggingConfig)
     docling: DoclingConfig = field(default_factory=DoclingConfig)
+    routing: RoutingConfig = field(default_factory=RoutingConfig)
+    autoscale: AutoscaleConfig = field(default_factory=AutoscaleConfig)
+    journal: JournalConfig = field(default_factory=JournalConfig)
+    manifest: ManifestConfig = field(default_factory=ManifestConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    documents: DocumentsConfig = field(default_factory=DocumentsConfig)
+    pipeline: PipelineConfig = field(default_factory=PipelineConfig)
+    server: ServerConfig = field(default_factory=ServerConfig)
 
 
 class ConfigManager:
@@ -69,7 +150,15 @@ class ConfigManager:
             limits=LimitsConfig(**config_data.get('limits', {})),
             serialization=SerializationConfig(**config_data.get('serialization', {})),
             logging=LoggingConfig(**config_data.get('logging', {})),
-            docling=DoclingConfig(**config_data.get('docling', {}))
+            docling=DoclingConfig(**config_data.get('docling', {})),
+            routing=RoutingConfig(**config_data.get('routing', {})),
+            autoscale=AutoscaleConfig(**config_data.get('autoscale', {})),
+            journal=JournalConfig(**config_data.get('journal', {})),
+            manifest=ManifestConfig(**config_data.get('manifest', {})),
+            cache=CacheConfig(**config_data.get('cache', {})),
+            documents=DocumentsConfig(**config_data.get('documents', {})),
+            pipeline=PipelineConfig(**config_data.get('pipeline', {})),
+            server=ServerConfig(**config_data.get('server', {}))
         )
 
         return self._config
@@ -81,6 +170,10 @@ class ConfigManager:
         # Override logging config
         if args.get('workers') is not None:
             config.logging.workers = args['workers']
+        if args.get('executor') is not None:
+            config.logging.executor = args['executor']
+        if args.get('schedule') is not None:
+            config.logging.schedule = args['schedule']
         if args.get('quiet') is not None:
             config.logging.progress = not args['quiet']
         if args.get('fail_fast') is not None:
@@ -92,6 +185,20 @@ class ConfigManager:
         if args.get('backend') is not None:
             config.docling.backend = args['backend']
 
+        # Re-exporting reads the saved documents
+        if args.get('reexport'):
+            config.documents.enabled = True
+
+        # Override server config
+        if args.get('host') is not None:
+            config.server.host = args['host']
+        if args.get('port') is not None:
+            config.server.port = args['port']
+        if args.get('socket_path') is not None:
+            config.server.socket_path = args['socket_path']
+        if args.get('max_queue') is not None:
+            config.server.max_queue = args['max_queue']
+
         return config
 
     @classmethod
@@ -1,16 +1,51 @@
 """Core PDF converter using Docling."""
 
+import gzip
+import json
+import queue
+import threading
 import time
+from contextlib import contextmanager
+from importlib import metadata
+from io import BytesIO
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
-
-from docling.document_converter import DocumentConverter
-from docling.datamodel.base_models import InputFormat
-from docling.datamodel.pipeline_options import PdfPipelineOptions
-from docling.document_converter import PdfFormatOption
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Optional, Tuple, Union
 
 from .config import Config
-from .utils import normalize_text
+from .probe import extract_text_layer, probe_layout, probe_text_layer
+from .utils import get_pdf_page_count, normalize_text
+
+# Docling and its model stack take seconds to import; they are imported where
+# a conversion first needs them, so the CLI and runs with nothing to convert
+# start without them
+if TYPE_CHECKING:
+    from docling.datamodel.base_models import DocumentStream
+    from docling.document_converter import DocumentConverter
+
+
+class StaleDocumentError(Exception):
+    """A saved document was converted from other input contents or by another Docling version."""
+
+
+def docling_version() -> str:
+    """Installed Docling version, read from package metadata without importing Docling."""
+    try:
+        return metadata.version('docling')
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+def failed_result_info(error_reason: str) -> Dict[str, Any]:
+    """result_info for a file that failed before producing any content."""
+    return {
+        'content': '',
+        'status': 'failed',
+        'error_reason': error_reason,
+        'duration_ms': 0,
+        'pages_total': 0,
+        'pages_with_text': 0,
+        'char_count': 0
+    }
 
 
 class PDFConverter:
@@ -20,9 +55,14 @@ class PDFConverter:
         self.config = config
         self._converter = None
 
-    def _get_converter(self) -> DocumentConverter:
+    def _get_converter(self) -> 'DocumentConverter':
         """Get or create DocumentConverter instance."""
         if self._converter is None:
+            from docling.datamodel.base_models import InputFormat
+            from docling.datamodel.pipeline_options import PdfPipelineOptions
+            from docling.datamodel.settings import settings
+            from docling.document_converter import DocumentConverter, PdfFormatOption
+
             # Configure pipeline options
             pipeline_options = PdfPipelineOptions()
             pipeline_options.do_ocr = False  # Only process PDFs with extractable text
@@ -33,20 +73,32 @@ class PDFConverter:
                 InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
             }
 
+            # Batch sizes used by convert_all; docling keeps them in global settings
+            if self.config.docling.doc_batch_size > 0:
+                settings.perf.doc_batch_size = self.config.docling.doc_batch_size
+            if self.config.docling.page_batch_size > 0:
+                settings.perf.page_batch_size = self.config.docling.page_batch_size
+
             self._converter = DocumentConverter(
                 format_options=format_options
             )
 
         return self._converter
 
-    def convert_pdf(self, pdf_path: Path, output_ext: str) -> Tuple[bool, Dict[str, Any]]:
+    def warm_up(self) -> None:
+        """Build the DocumentConverter and load the PDF pipeline models."""
+        from docling.datamodel.base_models import InputFormat
+
+        self._get_converter().initialize_pipeline(InputFormat.PDF)
+
+    def convert_pdf(self, pdf_path: Union[Path, 'DocumentStream'], output_ext: str) -> Tuple[bool, Dict[str, Any]]:
         """
         Convert PDF to text or markdown.
 
         Returns:
             Tuple of (success, result_info)
             result_info contains: content, pages_total, pages_with_text,
-            char_count, duration_ms, status, error_reason
+            char_count, duration_ms, status, error_reason, engine
         """
         start_time = time.time()
         result_info = {
@@ -56,15 +108,30 @@ class PDFConverter:
             'char_count': 0,
             'duration_ms': 0,
             'status': 'failed',
-            'error_reason': None
+            'error_reason': None,
+            'engine': 'docling'
         }
 
         try:
+            # Skip the models for PDFs over the page limit or without a text layer
+            if self._skip_before_conversion(pdf_path, result_info):
+                return False, result_info
+
+            # Simple documents do not need the models at all
+            if isinstance(pdf_path, Path) and self.choose_engine(pdf_path) == 'fast':
+                part = self._extract_text_layer_part(pdf_path)
+                if part is not None:
+                    return self.render_parts([part], output_ext)
+
             # Get converter
             converter = self._get_converter()
 
-            # Convert document
-            conversion_result = converter.convert(pdf_path)
+            # Convert document, or only its first pages when limits.truncate_to_max_pages applies
+            max_pages = self._truncate_pages()
+            if max_pages and result_info['pages_total'] > max_pages:
+                conversion_result = converter.convert(pdf_path, page_range=(1, max_pages))
+            else:
+                conversion_result = converter.convert(pdf_path)
 
             # Extract document
             doc = conversion_result.document
@@ -72,32 +139,10 @@ class PDFConverter:
             # Count pages
             result_info['pages_total'] = len(doc.pages) if hasattr(doc, 'pages') and doc.pages else 1
 
-            # Convert to target format
-            if output_ext == 'md':
-                content = doc.export_to_markdown()
-                # For markdown, only normalize text (includes cleaning)
-                content = normalize_text(content)
-            else:  # txt
-                # For text, we'll use the markdown export and then convert
-                content = doc.export_to_markdown()
-                # Convert markdown tables to tab-delimited if needed
-                content = self._convert_markdown_tables_to_tabs(content)
-                # Normalize and clean text
-                content = normalize_text(content)
-            result_info['content'] = content
-            result_info['char_count'] = len(content)
-
             # Count pages with text
             result_info['pages_with_text'] = self._count_pages_with_text(doc)
 
-            # Check if this is an image-only PDF
-            if result_info['char_count'] == 0:
-                result_info['status'] = 'skipped'
-                result_info['error_reason'] = 'image_only_pdf'
-                return False, result_info
-
-            result_info['status'] = 'ok'
-            return True, result_info
+            return self._fill_content(result_info, doc.export_to_markdown(), output_ext)
 
         except Exception as e:
             result_info['error_reason'] = str(e)
@@ -109,6 +154,338 @@ class PDFConverter:
             duration = time.time() - start_time
             result_info['duration_ms'] = int(duration * 1000)
 
+    def convert_bytes(self, name: str, data: bytes, output_ext: str) -> Tuple[bool, Dict[str, Any]]:
+        """Convert an in-memory PDF; see convert_pdf."""
+        from docling.datamodel.base_models import DocumentStream
+
+        return self.convert_pdf(DocumentStream(name=name, stream=BytesIO(data)), output_ext)
+
+    def _skip_before_conversion(self, source: Union[Path, 'DocumentStream'], result_info: Dict[str, Any]) -> bool:
+        """
+        Mark result_info as skipped for limit_exceeded_pages or image_only_pdf.
+
+        Both checks read the PDF structure only. pages_total is filled in
+        whenever the page count was read.
+        """
+        limits = self.config.limits
+        data = source if isinstance(source, Path) else source.stream.getvalue()
+
+        probe = probe_text_layer(data, limits.text_probe_pages) if limits.text_probe_pages > 0 else None
+        if probe is not None:
+            pages = probe.pages_total
+        else:
+            pages = get_pdf_page_count(data) if limits.max_pages else None
+        if pages:
+            result_info['pages_total'] = pages
+
+        if limits.max_pages and not limits.truncate_to_max_pages and pages and pages > limits.max_pages:
+            reason = 'limit_exceeded_pages'
+        elif probe is not None and not probe.has_text:
+            reason = 'image_only_pdf'
+        else:
+            return False
+
+        result_info['status'] = 'skipped'
+        result_info['error_reason'] = reason
+        return True
+
+    def _truncate_pages(self) -> int:
+        """Page limit applied by conversions under limits.truncate_to_max_pages, or 0."""
+        limits = self.config.limits
+        return limits.max_pages if limits.truncate_to_max_pages else 0
+
+    def choose_engine(self, pdf_path: Path) -> str:
+        """
+        Route a document to 'fast' (direct text-layer extraction) or 'docling'.
+
+        With routing.fast_path on, documents with dense text, few vector paths
+        and images, and a single column are extracted directly; anything that
+        may have tables or a complex layout goes through Docling.
+        """
+        routing = self.config.routing
+        if not routing.fast_path:
+            return 'docling'
+
+        sample_pages = self.config.limits.text_probe_pages
+        layout = probe_layout(pdf_path, sample_pages) if sample_pages > 0 else probe_layout(pdf_path)
+        if layout is None:
+            return 'docling'
+
+        simple = (
+            layout.chars_per_page >= routing.min_chars_per_page
+            and layout.paths_per_page <= routing.max_paths_per_page
+            and layout.images_per_page <= routing.max_images_per_page
+            and layout.columns <= routing.max_columns
+        )
+        return 'fast' if simple else 'docling'
+
+    def plan_page_ranges(self, pdf_path: Path) -> List[Tuple[int, int]]:
+        """
+        Split a large PDF into page windows that can be converted in parallel.
+
+        Only the first limits.max_pages pages are planned when
+        limits.truncate_to_max_pages is on.
+
+        Returns:
+            List of 1-based inclusive (start, end) page ranges, or an empty
+            list when the whole document is converted in one piece
+        """
+        threshold = self.config.docling.page_shard_threshold
+        window = self.config.docling.page_shard_size
+        sharding = bool(threshold) and window > 0
+        max_pages = self._truncate_pages()
+        if not sharding and not max_pages:
+            return []
+
+        pages = get_pdf_page_count(pdf_path)
+        if not pages:
+            return []
+
+        truncated = bool(max_pages) and pages > max_pages
+        if truncated:
+            pages = max_pages
+
+        if sharding and pages > threshold:
+            return [(start, min(start + window - 1, pages)) for start in range(1, pages + 1, window)]
+        return [(1, pages)] if truncated else []
+
+    def extract_markdown(self, pdf_path: Path, page_range: Optional[Tuple[int, int]] = None) -> Dict[str, Any]:
+        """
+        Run the model pipeline on a PDF, or one page window of it, and export raw markdown.
+
+        This is the expensive stage of a conversion; render_parts() turns
+        the parts into final content.
+
+        Returns:
+            Part info with page_range, markdown, pages_total, pages_with_text,
+            duration_ms and engine
+        """
+        if page_range is None and self.choose_engine(pdf_path) == 'fast':
+            part = self._extract_text_layer_part(pdf_path)
+            if part is not None:
+                return part
+
+        start_time = time.time()
+
+        converter = self._get_converter()
+        if page_range:
+            doc = converter.convert(pdf_path, page_range=page_range).document
+        else:
+            doc = converter.convert(pdf_path).document
+
+        return self._markdown_part(doc, page_range, start_time)
+
+    def extract_markdown_batch(self, pdf_paths: List[Path]) -> List[Tuple[bool, Union[Dict[str, Any], str]]]:
+        """
+        Run the model pipeline on several PDFs with a single convert_all call.
+
+        Docling pipelines pages across the whole batch, which keeps the models
+        busy between small documents. A document that fails does not affect
+        the others.
+
+        Returns:
+            One (ok, value) pair per input, in input order: the part info as
+            returned by extract_markdown, or the error message
+        """
+        outcomes: Dict[int, Tuple[bool, Union[Dict[str, Any], str]]] = {}
+
+        # Simple documents skip the batch
+        for index, pdf_path in enumerate(pdf_paths):
+            if self.choose_engine(pdf_path) == 'fast':
+                part = self._extract_text_layer_part(pdf_path)
+                if part is not None:
+                    outcomes[index] = (True, part)
+
+        remaining = [index for index in range(len(pdf_paths)) if index not in outcomes]
+        if remaining:
+            from docling.datamodel.base_models import ConversionStatus
+
+            converter = self._get_converter()
+
+            start_time = time.time()
+            conversion_results = converter.convert_all([pdf_paths[index] for index in remaining], raises_on_error=False)
+            for index, conversion_result in zip(remaining, conversion_results):
+                if conversion_result.status in (ConversionStatus.SUCCESS, ConversionStatus.PARTIAL_SUCCESS):
+                    outcomes[index] = (True, self._markdown_part(conversion_result.document, None, start_time))
+                else:
+                    errors = [getattr(error, 'error_message', str(error)) for error in conversion_result.errors]
+                    outcomes[index] = (False, '; '.join(errors) or f"conversion {conversion_result.status.value}")
+
+                # Each document is timed from the end of the previous one
+                start_time = time.time()
+
+        return [outcomes[index] for index in range(len(pdf_paths))]
+
+    def _markdown_part(self, doc, page_range: Optional[Tuple[int, int]], start_time: float) -> Dict[str, Any]:
+        part = {
+            'page_range': page_range,
+            'markdown': doc.export_to_markdown(),
+            'pages_total': len(doc.pages) if hasattr(doc, 'pages') and doc.pages else 0,
+            'pages_with_text': self._count_pages_with_text(doc),
+            'duration_ms': int((time.time() - start_time) * 1000),
+            'engine': 'docling'
+        }
+
+        # Kept so that other formats can be exported later without the models
+        if self.config.documents.enabled:
+            part['document'] = doc.export_to_dict()
+
+        return part
+
+    def _extract_text_layer_part(self, pdf_path: Path) -> Optional[Dict[str, Any]]:
+        """Part info like extract_markdown's, built from the PDF text layer; None if unreadable."""
+        start_time = time.time()
+
+        pages = extract_text_layer(pdf_path, self._truncate_pages())
+        if pages is None:
+            return None
+
+        return {
+            'page_range': None,
+            'markdown': '\n\n'.join(page for page in pages if page),
+            'pages_total': len(pages),
+            'pages_with_text': sum(1 for page in pages if page),
+            'duration_ms': int((time.time() - start_time) * 1000),
+            'engine': 'fast'
+        }
+
+    def render_parts(self, parts: List[Dict[str, Any]], output_ext: str) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Turn parts from extract_markdown() into the result of a whole-document conversion.
+
+        Page-window parts are joined in page order with the same blank-line
+        separator Docling uses between items, then rendered exactly like
+        convert_pdf.
+
+        Returns:
+            Tuple of (success, result_info) as returned by convert_pdf
+        """
+        parts = sorted(parts, key=lambda part: part['page_range'] or (0, 0))
+        result_info = {
+            'content': '',
+            'pages_total': sum(part['pages_total'] for part in parts) or 1,
+            'pages_with_text': sum(part['pages_with_text'] for part in parts),
+            'char_count': 0,
+            'duration_ms': sum(part['duration_ms'] for part in parts),
+            'status': 'failed',
+            'error_reason': None,
+            'engine': parts[0].get('engine', 'docling') if parts else 'docling'
+        }
+
+        markdown = '\n\n'.join(part['markdown'] for part in parts if part['markdown'])
+        return self._fill_content(result_info, markdown, output_ext)
+
+    def save_parts(self, parts: List[Dict[str, Any]], document_file: Path, source_hash: Optional[str] = None) -> None:
+        """
+        Save the parts of a conversion as gzip-compressed JSON.
+
+        Docling parts are stored as their DoclingDocument, text-layer parts as
+        their markdown. The content hash of the input and the Docling version
+        are stored with them, so that load_parts() can tell a stale document.
+        The file is written next to it and renamed into place.
+        """
+        saved_parts = []
+        for part in sorted(parts, key=lambda part: part['page_range'] or (0, 0)):
+            saved = {
+                'page_range': part['page_range'],
+                'pages_total': part['pages_total'],
+                'pages_with_text': part['pages_with_text']
+            }
+            if 'document' in part:
+                saved['document'] = part['document']
+            else:
+                saved['markdown'] = part['markdown']
+            saved_parts.append(saved)
+
+        document_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = document_file.with_name(f".{document_file.name}.{threading.get_ident()}.tmp")
+        try:
+            with gzip.open(tmp_file, 'wt', encoding='utf-8') as f:
+                json.dump(
+                    {'version': 1, 'source_hash': source_hash, 'docling': docling_version(), 'parts': saved_parts},
+                    f,
+                    ensure_ascii=False
+                )
+            tmp_file.replace(document_file)
+        finally:
+            if tmp_file.exists():
+                tmp_file.unlink()
+
+    def load_parts(self, document_file: Path, source_hash: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Rebuild extract_markdown() parts from a file written by save_parts(), without the models.
+
+        Given the current content hash of the input, raises StaleDocumentError
+        if the document was converted from other contents or by another
+        Docling version. Documents saved before these were recorded are taken
+        as current.
+        """
+        from docling_core.types.doc import DoclingDocument
+
+        start_time = time.time()
+        with gzip.open(document_file, 'rt', encoding='utf-8') as f:
+            saved_document = json.load(f)
+
+        if source_hash is not None:
+            saved_hash = saved_document.get('source_hash')
+            saved_docling = saved_document.get('docling')
+            if (saved_hash and saved_hash != source_hash) or (saved_docling and saved_docling != docling_version()):
+                raise StaleDocumentError(f"{document_file} was saved from another input or Docling version")
+
+        saved_parts = saved_document['parts']
+
+        parts = []
+        for saved in saved_parts:
+            if 'document' in saved:
+                markdown = DoclingDocument.model_validate(saved['document']).export_to_markdown()
+            else:
+                markdown = saved['markdown']
+
+            parts.append({
+                'page_range': tuple(saved['page_range']) if saved['page_range'] else None,
+                'markdown': markdown,
+                'pages_total': saved['pages_total'],
+                'pages_with_text': saved['pages_with_text'],
+                'duration_ms': 0,
+                'engine': 'reexport'
+            })
+
+        parts[0]['duration_ms'] = int((time.time() - start_time) * 1000)
+        return parts
+
+    def _fill_content(self, result_info: Dict[str, Any], markdown: str, output_ext: str) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Render exported markdown into result_info and set its status.
+
+        output_ext may list several formats, e.g. "txt,md": all are rendered
+        from the same markdown, content holds the first and contents maps
+        every format to its content.
+        """
+        contents = {ext: self._render_format(markdown, ext) for ext in output_ext.split(',')}
+        content = next(iter(contents.values()))
+        result_info['content'] = content
+        result_info['char_count'] = len(content)
+        if len(contents) > 1:
+            result_info['contents'] = contents
+
+        # Check if this is an image-only PDF
+        if result_info['char_count'] == 0:
+            result_info['status'] = 'skipped'
+            result_info['error_reason'] = 'image_only_pdf'
+            return False, result_info
+
+        result_info['status'] = 'ok'
+        return True, result_info
+
+    def _render_format(self, markdown: str, output_ext: str) -> str:
+        """Render exported markdown as one output format."""
+        if output_ext == 'md':
+            # For markdown, only normalize text (includes cleaning)
+            return normalize_text(markdown)
+
+        # txt: convert markdown tables to tab-delimited, then normalize and clean
+        return normalize_text(self._convert_markdown_tables_to_tabs(markdown))
+
     def _convert_to_text(self, doc) -> str:
         """Convert document to plain text with tab-delimited tables."""
         content_parts = []
@@ -213,19 +590,115 @@ class PDFConverter:
         Returns:
             Tuple of (has_text, reason)
         """
-        try:
-            converter = self._get_converter()
-            result = converter.convert(pdf_path)
-            doc = result.document
-
-            # Check if document has extractable text
+        # Checked even when the pre-conversion probe is disabled
+        sample_pages = self.config.limits.text_probe_pages
+        probe = probe_text_layer(pdf_path, sample_pages) if sample_pages > 0 else probe_text_layer(pdf_path)
+        if probe is None:
+            return False, "validation_error: unreadable_pdf"
+        if not probe.has_text:
+            return False, "image_only_pdf"
+        return True, "has_text"
+
+
+class ConverterPool:
+    """
+    Checkout pool of PDFConverter instances for worker threads.
+
+    Each instance (and its DocumentConverter) is built once and reused. With
+    no size, a new instance is created whenever all existing ones are checked
+    out, which gives one instance per worker thread. With a size, threads wait
+    for a free instance, and that wait is tracked in stats().
+
+    The instance held by a thread abandoned on timeout is discarded, so that
+    its slot goes to a new instance instead of waiting for the stuck call.
+    """
+
+    def __init__(self, config: Config, size: Optional[int] = None):
+        self.config = config
+        self.size = size if size and size > 0 else None
+        # None in the queue marks a slot freed by discard()
+        self._free: queue.LifoQueue = queue.LifoQueue()
+        self._checked_out: Dict[int, PDFConverter] = {}
+        self._created = 0
+        self._discarded = 0
+        self._lock = threading.Lock()
+
+        # Contention metrics
+        self._checkouts = 0
+        self._contended = 0
+        self._wait_ms = 0.0
+        self._max_wait_ms = 0.0
+
+    def prewarm(self) -> None:
+        """Build and warm one more instance if the pool has room for it."""
+        if not self._reserve():
+            return
+
+        converter = PDFConverter(self.config)
+        converter.warm_up()
+        self._free.put(converter)
+
+    @contextmanager
+    def checkout(self) -> Iterator[PDFConverter]:
+        """Borrow an instance for the duration of the with block."""
+        start = time.perf_counter()
+        contended = False
+
+        converter = None
+        while converter is None:
             try:
-                markdown_content = doc.export_to_markdown()
-                if markdown_content and markdown_content.strip():
-                    return True, "has_text"
-                return False, "image_only_pdf"
-            except:
-                return False, "export_error"
+                converter = self._free.get_nowait()
+            except queue.Empty:
+                if self._reserve():
+                    converter = PDFConverter(self.config)
+                else:
+                    contended = True
+                    converter = self._free.get()
+
+        wait_ms = (time.perf_counter() - start) * 1000
+        thread_id = threading.get_ident()
+        with self._lock:
+            self._checked_out[thread_id] = converter
+            self._checkouts += 1
+            self._contended += contended
+            self._wait_ms += wait_ms
+            self._max_wait_ms = max(self._max_wait_ms, wait_ms)
 
-        except Exception as e:
-            return False, f"validation_error: {str(e)}"
\ No newline at end of file
+        try:
+            yield converter
+        finally:
+            with self._lock:
+                kept = self._checked_out.pop(thread_id, None) is converter
+            if kept:
+                self._free.put(converter)
+
+    def discard(self, thread_id: int) -> None:
+        """Drop the instance checked out by an abandoned thread and free its slot."""
+        with self._lock:
+            if self._checked_out.pop(thread_id, None) is None:
+                return
+            self._created -= 1
+            self._discarded += 1
+
+        # Wake a thread waiting for an instance, which builds the replacement
+        self._free.put(None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Instance count, checkouts and time spent waiting for a free instance."""
+        with self._lock:
+            return {
+                'instances': self._created,
+                'discarded': self._discarded,
+                'checkouts': self._checkouts,
+                'contended_checkouts': self._contended,
+                'total_wait_ms': int(self._wait_ms),
+                'max_wait_ms': int(self._max_wait_ms)
+            }
+
+    def _reserve(self) -> bool:
+        """Claim a slot for a new instance; False if the pool is full."""
+        with self._lock:
+            if self.size is not None and self._created >= self.size:
+                return False
+            self._created += 1
+            return True
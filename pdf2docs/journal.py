@@ -0,0 +1,206 @@
+"""SQLite run journal for crash-safe resume."""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from .store import BatchedStore
+from .tasks import FileTask
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    input_file TEXT PRIMARY KEY,
+    output_file TEXT NOT NULL,
+    language TEXT NOT NULL,
+    output_ext TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    fingerprint TEXT,
+    error_reason TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_state ON files (state);
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    input_path TEXT NOT NULL,
+    output_ext TEXT NOT NULL,
+    language TEXT,
+    pattern TEXT,
+    recursive INTEGER NOT NULL,
+    reexport INTEGER NOT NULL,
+    finished INTEGER NOT NULL DEFAULT 0,
+    started_at TEXT NOT NULL
+);
+"""
+
+
+class RunJournal(BatchedStore):
+    """
+    Records the state of every file of a run in a SQLite database.
+
+    States are queued, running, ok, failed and skipped. A file interrupted by
+    a crash stays running and one cancelled on shutdown goes back to queued,
+    so unfinished() returns exactly the work a resumed run has to redo.
+
+    Streaming runs also record each folder scan, so a resumed run can finish
+    scanning the part of the input an interrupted run never reached.
+    """
+
+    def __init__(self, db_path: Path):
+        super().__init__(db_path, _SCHEMA)
+
+    def enqueue(self, tasks: Iterable[FileTask]) -> None:
+        """Add tasks as queued; files already journaled keep their attempt count."""
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT INTO files (input_file, output_file, language, output_ext, state, fingerprint, updated_at)
+                VALUES (?, ?, ?, ?, 'queued', ?, ?)
+                ON CONFLICT (input_file) DO UPDATE SET
+                    output_file = excluded.output_file,
+                    language = excluded.language,
+                    output_ext = excluded.output_ext,
+                    state = 'queued',
+                    attempts = CASE WHEN files.fingerprint = excluded.fingerprint THEN files.attempts ELSE 0 END,
+                    fingerprint = excluded.fingerprint,
+                    error_reason = NULL,
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    (str(task.input_file), str(task.output_file), task.language, task.output_ext, task.fingerprint, now)
+                    for task in tasks
+                )
+            )
+            self._changed()
+
+    def record_skip(self, task: FileTask, reason: str) -> None:
+        """Record a file skipped before conversion."""
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO files (input_file, output_file, language, output_ext, state, error_reason, updated_at)
+                VALUES (?, ?, ?, ?, 'skipped', ?, ?)
+                ON CONFLICT (input_file) DO UPDATE SET
+                    state = 'skipped', error_reason = excluded.error_reason, updated_at = excluded.updated_at
+                """,
+                (str(task.input_file), str(task.output_file), task.language, task.output_ext, reason, datetime.now().isoformat())
+            )
+            self._changed()
+
+    def mark_running(self, input_file: Path) -> None:
+        """Record that a file was handed to the workers."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE files SET state = 'running', updated_at = ? WHERE input_file = ?",
+                (datetime.now().isoformat(), str(input_file))
+            )
+            self._changed()
+
+    def mark_finished(self, input_file: Path, state: str, error_reason: Optional[str] = None) -> None:
+        """
+        Record the outcome of an attempt: ok, failed, skipped, or queued when
+        cancelled. A cancelled file, possibly never started, keeps its attempt count.
+        """
+        with self._lock:
+            self._conn.execute(
+                """
+                UPDATE files SET
+                    state = ?,
+                    attempts = attempts + CASE WHEN ? = 'queued' THEN 0 ELSE 1 END,
+                    error_reason = ?,
+                    updated_at = ?
+                WHERE input_file = ?
+                """,
+                (state, state, error_reason, datetime.now().isoformat(), str(input_file))
+            )
+            self._changed()
+
+    def unfinished(self, max_attempts: int) -> List[FileTask]:
+        """Tasks left queued or running, plus failures with attempts to spare; files deleted since are left out."""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT input_file, output_file, language, output_ext FROM files
+                WHERE state IN ('queued', 'running') OR (state = 'failed' AND attempts < ?)
+                ORDER BY rowid
+                """,
+                (max_attempts,)
+            ).fetchall()
+
+        tasks = []
+        for input_file, output_file, language, output_ext in rows:
+            try:
+                tasks.append(FileTask(Path(input_file), Path(output_file), language, output_ext))
+            except FileNotFoundError:
+                continue
+        return tasks
+
+    def start_scan(
+        self,
+        input_path: Path,
+        output_ext: str,
+        language: Optional[str],
+        pattern: Optional[str],
+        recursive: bool,
+        reexport: bool
+    ) -> int:
+        """Record a scan that is starting; an unfinished scan of the same input is superseded by it."""
+        params = (str(input_path), output_ext, language, pattern, int(recursive), int(reexport))
+        with self._lock:
+            self._conn.execute(
+                """
+                UPDATE scans SET finished = 1
+                WHERE finished = 0 AND input_path = ? AND output_ext = ? AND language IS ?
+                    AND pattern IS ? AND recursive = ? AND reexport = ?
+                """,
+                params
+            )
+            cursor = self._conn.execute(
+                """
+                INSERT INTO scans (input_path, output_ext, language, pattern, recursive, reexport, started_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                params + (datetime.now().isoformat(),)
+            )
+            # Committed right away: the scan must be on disk before any of its files
+            self._conn.commit()
+            return cursor.lastrowid
+
+    def finish_scan(self, scan_id: int) -> None:
+        """Record that a scan reached the end of its input."""
+        with self._lock:
+            self._conn.execute("UPDATE scans SET finished = 1 WHERE id = ?", (scan_id,))
+            self._changed()
+
+    def unfinished_scans(self) -> List[dict]:
+        """Scans an interrupted run did not complete, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT id, input_path, output_ext, language, pattern, recursive, reexport, started_at
+                FROM scans WHERE finished = 0 ORDER BY id
+                """
+            ).fetchall()
+        return [
+            {
+                'id': scan_id,
+                'input_path': Path(input_path),
+                'output_ext': output_ext,
+                'language': language,
+                'pattern': pattern,
+                'recursive': bool(recursive),
+                'reexport': bool(reexport),
+                'started_at': started_at,
+            }
+            for scan_id, input_path, output_ext, language, pattern, recursive, reexport, started_at in rows
+        ]
+
+    def seen_since(self, input_file: Path, since: str) -> bool:
+        """Whether the file was journaled at or after the given ISO timestamp."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM files WHERE input_file = ? AND updated_at >= ?",
+                (str(input_file), since)
+            ).fetchone()
+        return row is not None
@@ -6,7 +6,7 @@ import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 
 from .config import LoggingConfig
 
@@ -20,7 +20,7 @@ class ProcessingMetrics:
     language: str
     duration_ms: int
     file_size_bytes: int
-    status: str  # ok|skipped|failed
+    status: str  # ok|skipped|failed|cancelled
     error_reason: Optional[str] = None
     pages_total: int = 0
     pages_with_text: int = 0
@@ -33,11 +33,13 @@ class ProcessingSummary:
     converted: int
     skipped: int
     failed: int
+    cancelled: int
     total_time_sec: float
     start_time: str
     end_time: str
     skipped_reasons: Dict[str, int]
     error_reasons: Dict[str, int]
+    stats: Dict[str, Dict[str, Any]] = field(default_factory=dict)
 
 
 class StructuredLogger:
@@ -46,6 +48,7 @@ class StructuredLogger:
     def __init__(self, config: LoggingConfig):
         self.config = config
         self.metrics: List[ProcessingMetrics] = []
+        self.summary_stats: Dict[str, Dict[str, Any]] = {}
         self.start_time = datetime.now()
 
         # Set up file logger
@@ -146,6 +149,34 @@ class StructuredLogger:
         # Log to file
         self.logger.info("File skipped", extra={"metrics": asdict(metrics)})
 
+    def log_cancel(
+        self,
+        input_file: Path,
+        output_file: Path,
+        language: str,
+        file_size: int
+    ):
+        """Log a file left unfinished by a shutdown, to be picked up by the next run."""
+        timestamp = datetime.now().isoformat()
+
+        metrics = ProcessingMetrics(
+            timestamp=timestamp,
+            level="INFO",
+            input_file=str(input_file),
+            output_file=str(output_file),
+            language=language,
+            duration_ms=0,
+            file_size_bytes=file_size,
+            status="cancelled",
+            error_reason="cancelled"
+        )
+
+        # Store metrics
+        self.metrics.append(metrics)
+
+        # Log to file
+        self.logger.info("File cancelled", extra={"metrics": asdict(metrics)})
+
     def log_error(self, message: str, input_file: Optional[Path] = None, error: Optional[Exception] = None):
         """Log error message."""
         extra = {}
@@ -160,6 +191,10 @@ class StructuredLogger:
         """Log info message."""
         self.logger.info(message, extra=kwargs)
 
+    def add_summary_stats(self, name: str, stats: Dict[str, Any]):
+        """Attach a named group of run-level metrics to the summary."""
+        self.summary_stats[name] = stats
+
     def get_summary(self) -> ProcessingSummary:
         """Generate processing summary."""
         end_time = datetime.now()
@@ -169,6 +204,7 @@ class StructuredLogger:
         converted = sum(1 for m in self.metrics if m.status == 'ok')
         skipped = sum(1 for m in self.metrics if m.status == 'skipped')
         failed = sum(1 for m in self.metrics if m.status == 'failed')
+        cancelled = sum(1 for m in self.metrics if m.status == 'cancelled')
 
         # Count skip reasons
         skipped_reasons = {}
@@ -187,11 +223,13 @@ class StructuredLogger:
             converted=converted,
             skipped=skipped,
             failed=failed,
+            cancelled=cancelled,
             total_time_sec=total_time,
             start_time=self.start_time.isoformat(),
             end_time=end_time.isoformat(),
             skipped_reasons=skipped_reasons,
-            error_reasons=error_reasons
+            error_reasons=error_reasons,
+            stats=dict(self.summary_stats)
         )
 
     def print_summary(self):
@@ -205,6 +243,8 @@ class StructuredLogger:
         print(f"Successfully converted: {summary.converted}")
         print(f"Skipped: {summary.skipped}")
         print(f"Failed: {summary.failed}")
+        if summary.cancelled:
+            print(f"Cancelled: {summary.cancelled}")
         print(f"Total time: {summary.total_time_sec:.2f} seconds")
 
         if summary.skipped_reasons:
@@ -217,6 +257,11 @@ class StructuredLogger:
             for reason, count in summary.error_reasons.items():
                 print(f"  {reason}: {count}")
 
+        for name, stats in summary.stats.items():
+            print(f"\n{name.replace('_', ' ').capitalize()}:")
+            for key, value in stats.items():
+                print(f"  {key}: {value}")
+
         print(f"\nLog file: {self.log_file_path}")
         print("="*60)
 
@@ -0,0 +1,103 @@
+"""Output manifest for incremental reconversion."""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .cache import content_hash, pipeline_fingerprint
+from .config import Config
+from .store import BatchedStore
+from .tasks import FileTask
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outputs (
+    output_file TEXT PRIMARY KEY,
+    input_file TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    pipeline_fingerprint TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+class OutputManifest(BatchedStore):
+    """
+    Records which input and pipeline produced each output.
+
+    An existing output is only up to date if its input still has the
+    recorded content and the pipeline fingerprint (pdf2docs and Docling
+    versions, output-shaping settings) has not changed. Size and mtime are
+    compared first so unchanged inputs are never hashed.
+    """
+
+    def __init__(self, db_path: Path, config: Config):
+        super().__init__(db_path, _SCHEMA)
+        self.fingerprint = pipeline_fingerprint(config)
+
+    def stale_reason(self, output_file: Path, task: FileTask) -> Optional[str]:
+        """
+        Why an existing output of a task must be regenerated: input_changed or
+        pipeline_changed, or None if it is up to date.
+
+        Outputs without a manifest entry, written before the manifest
+        existed, are taken as up to date.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT input_file, size, mtime_ns, content_hash, pipeline_fingerprint FROM outputs WHERE output_file = ?",
+                (str(output_file),)
+            ).fetchone()
+        if row is None:
+            return None
+
+        recorded_input, size, mtime_ns, recorded_hash, fingerprint = row
+        if fingerprint != self.fingerprint:
+            return 'pipeline_changed'
+
+        if recorded_input == str(task.input_file) and task.size == size and task.mtime_ns == mtime_ns:
+            return None
+
+        # Touched, copied or renamed: only a content change counts. The hash
+        # stays on the task for the cache and for record()
+        if task.size == size:
+            if task.content_hash is None:
+                task.content_hash = content_hash(task.input_file)
+            if task.content_hash == recorded_hash:
+                self._update_stat(output_file, task)
+                return None
+
+        return 'input_changed'
+
+    def record(self, output_files: Iterable[Path], task: FileTask) -> None:
+        """
+        Record that the task's input was just converted to output_files with
+        the current pipeline.
+
+        The content hash is the one the pipeline put on the task off the
+        dispatch loop; the input is only hashed here if it is missing.
+        """
+        file_hash = task.content_hash or content_hash(task.input_file)
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO outputs
+                    (output_file, input_file, size, mtime_ns, content_hash, pipeline_fingerprint, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (str(output_file), str(task.input_file), task.size, task.mtime_ns, file_hash, self.fingerprint, now)
+                    for output_file in output_files
+                ]
+            )
+            self._changed()
+
+    def _update_stat(self, output_file: Path, task: FileTask) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outputs SET input_file = ?, size = ?, mtime_ns = ? WHERE output_file = ?",
+                (str(task.input_file), task.size, task.mtime_ns, str(output_file))
+            )
+            self._changed()
@@ -0,0 +1,442 @@
+"""Staged conversion pipeline: model conversion, post-processing and output writing."""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import ConversionCache, content_hash
+from .config import Config
+from .converter import PDFConverter, StaleDocumentError, failed_result_info
+from .pool import SupervisedPool, TaskCancelledError, TaskTimeoutError, WorkerCrashedError, gather_futures
+from .tasks import FileTask
+from .workers import extract_markdown, extract_markdown_batch, write_output
+
+
+class ConversionPipeline:
+    """
+    Moves each file through three stages with their own concurrency.
+
+    1. conversion: the model pipeline on the worker pool, producing raw markdown
+    2. post-processing: table conversion and text normalization on a thread pool
+    3. writing: the output files on an I/O thread pool
+
+    Conversion workers hand their markdown over and take the next file while
+    earlier files are still being cleaned and written. submit() returns a
+    future that resolves to (success, result_info) once the file has left
+    the last stage.
+
+    With docling.batch_size above 1, unsharded files are buffered and sent to
+    the workers in groups converted by one convert_all call; flush() sends a
+    partial group.
+
+    submit() takes the output file of each requested format; all of them are
+    rendered from the markdown of a single conversion.
+
+    With a cache, files whose content was converted before skip straight to
+    writing, and new conversions are stored once written. Given a document
+    file, a saved conversion is exported again without the workers, or a new
+    conversion is saved there. A saved conversion of other input contents,
+    or made by another Docling version, is converted again and replaced.
+
+    Reading a whole file for its content hash never happens on the caller's
+    thread: the cache lookup runs on its own thread pool, and with
+    hash_inputs the writer threads hash files no lookup did. Either way the
+    hash is kept on the FileTask for the output manifest.
+    """
+
+    def __init__(
+        self,
+        pool: SupervisedPool,
+        converter: PDFConverter,
+        config: Config,
+        cache: Optional[ConversionCache] = None,
+        hash_inputs: bool = False
+    ):
+        self.pool = pool
+        self.converter = converter
+        self.config = config
+        self.cache = cache
+        self.hash_inputs = hash_inputs
+
+        self._lookup = None
+        if cache is not None:
+            self._lookup = ThreadPoolExecutor(
+                max_workers=config.pipeline.write_workers,
+                thread_name_prefix='pdf2docs-lookup'
+            )
+
+        self._postprocess = ThreadPoolExecutor(
+            max_workers=config.pipeline.postprocess_workers,
+            thread_name_prefix='pdf2docs-postprocess'
+        )
+        self._writer = ThreadPoolExecutor(
+            max_workers=config.pipeline.write_workers,
+            thread_name_prefix='pdf2docs-write'
+        )
+
+        self._lock = threading.Lock()
+        self._converting = 0
+        self._lookups = 0
+        self._flush_after_lookups = False
+        self._batch: List[Tuple[Path, Dict[str, Path], Future]] = []
+        self._batches = 0
+        self._batch_retries = 0
+        self._cache_keys: Dict[Future, Dict[str, str]] = {}
+        self._document_files: Dict[Future, Tuple[Path, FileTask]] = {}
+        self._unhashed: Dict[Future, FileTask] = {}
+        self._postprocess_ms = 0.0
+        self._write_ms = 0.0
+
+    @property
+    def converting(self) -> int:
+        """Files currently in the conversion stage, or in the cache lookup that may send them there."""
+        with self._lock:
+            return self._converting + self._lookups
+
+    def submit(
+        self,
+        task: FileTask,
+        output_files: Dict[str, Path],
+        document_file: Optional[Path] = None
+    ) -> Future:
+        """Start a file down the pipeline, split into page windows if it is large."""
+        result = Future()
+        result.set_running_or_notify_cancel()
+
+        if self._lookup is None:
+            self._start(task, output_files, document_file, result)
+            return result
+
+        with self._lock:
+            self._lookups += 1
+            self._flush_after_lookups = False
+        self._lookup.submit(self._run_lookup, task, output_files, document_file, result)
+        return result
+
+    def _run_lookup(
+        self,
+        task: FileTask,
+        output_files: Dict[str, Path],
+        document_file: Optional[Path],
+        result: Future
+    ) -> None:
+        """Serve a file from the cache, or send it on to conversion."""
+        try:
+            if not self._serve_from_cache(task, output_files, result):
+                self._start(task, output_files, document_file, result)
+        except Exception as e:
+            result.set_exception(e)
+        finally:
+            with self._lock:
+                self._lookups -= 1
+                flush = self._flush_after_lookups and self._lookups == 0
+            if flush:
+                self.flush()
+
+    def _start(
+        self,
+        task: FileTask,
+        output_files: Dict[str, Path],
+        document_file: Optional[Path],
+        result: Future
+    ) -> None:
+        """Send a file to the workers, or straight to export if it has a saved document."""
+        if self.hash_inputs and task.content_hash is None:
+            with self._lock:
+                self._unhashed[result] = task
+            result.add_done_callback(self._forget_file_state)
+
+        if document_file is not None:
+            if document_file.exists():
+                # Converted before: only export and post-processing are left
+                self._postprocess.submit(self._run_reexport, task, document_file, result, output_files)
+                return
+
+            self._save_document(task, document_file, result)
+
+        self._convert(task.input_file, output_files, result)
+
+    def _save_document(self, task: FileTask, document_file: Path, result: Future) -> None:
+        """Have the conversion of a file saved to document_file."""
+        with self._lock:
+            self._document_files[result] = (document_file, task)
+        result.add_done_callback(self._forget_file_state)
+
+    def _convert(self, input_file: Path, output_files: Dict[str, Path], result: Future, batch: bool = True) -> None:
+        """Send a file to the workers, batched unless batch is False, or split into page windows."""
+        with self._lock:
+            self._converting += 1
+
+        page_ranges = self.converter.plan_page_ranges(input_file)
+        if not page_ranges and batch and self.config.docling.batch_size > 1:
+            with self._lock:
+                self._batch.append((input_file, output_files, result))
+                if len(self._batch) < self.config.docling.batch_size:
+                    return
+                batch, self._batch = self._batch, []
+            self._send_batch(batch)
+            return
+
+        try:
+            if page_ranges:
+                extracted = gather_futures([
+                    self.pool.submit(extract_markdown, input_file, page_range)
+                    for page_range in page_ranges
+                ])
+            else:
+                extracted = gather_futures([self.pool.submit(extract_markdown, input_file)])
+        except WorkerCrashedError as e:
+            # The pool gave up on starting its workers
+            self._finish_conversion(result, error=e)
+            return
+        except RuntimeError:
+            # Pool shut down while a cache lookup or re-export ran
+            self._finish_conversion(result, error=TaskCancelledError('conversion cancelled'))
+            return
+
+        extracted.add_done_callback(lambda f: self._on_extracted(f, result, output_files))
+
+    def _serve_from_cache(self, task: FileTask, output_files: Dict[str, Path], result: Future) -> bool:
+        """Send a cache hit straight to writing; on a miss remember the keys for storing the result."""
+        try:
+            if task.content_hash is None:
+                task.content_hash = content_hash(task.input_file)
+        except OSError:
+            # Unreadable here; the conversion reports the error
+            return False
+        keys = self.cache.keys_for(task.content_hash, output_files)
+
+        # Every requested format must be cached, or the file is converted anyway
+        contents = {}
+        result_info = None
+        for output_ext, key in keys.items():
+            cached = self.cache.get(key)
+            if cached is None:
+                break
+            contents[output_ext], info = cached
+            result_info = result_info or info
+        else:
+            result_info.update(contents=contents, duration_ms=0, engine='cache')
+            self._writer.submit(self._run_write, result_info, result, output_files)
+            return True
+
+        with self._lock:
+            self._cache_keys[result] = keys
+        result.add_done_callback(self._forget_file_state)
+        return False
+
+    def _forget_file_state(self, result: Future) -> None:
+        with self._lock:
+            self._cache_keys.pop(result, None)
+            self._document_files.pop(result, None)
+            self._unhashed.pop(result, None)
+
+    def flush(self) -> None:
+        """Send the files buffered for a batch to the workers, and those still in a cache lookup once it ends."""
+        with self._lock:
+            self._flush_after_lookups = self._lookups > 0
+            batch, self._batch = self._batch, []
+        self._send_batch(batch)
+
+    def _send_batch(self, batch: List[Tuple[Path, Dict[str, Path], Future]]) -> None:
+        if not batch:
+            return
+
+        # The per-file timeout scales with the number of files in the batch
+        timeout = self.pool.task_timeout * len(batch) if self.pool.task_timeout else None
+
+        try:
+            extracted = self.pool.submit_with_timeout(timeout, extract_markdown_batch, [input_file for input_file, _, _ in batch])
+        except WorkerCrashedError as e:
+            # The pool gave up on starting its workers
+            for _, _, result in batch:
+                self._finish_conversion(result, error=e)
+            return
+        except RuntimeError:
+            # Pool already shut down
+            for _, _, result in batch:
+                self._finish_conversion(result, error=TaskCancelledError('conversion cancelled'))
+            return
+
+        with self._lock:
+            self._batches += 1
+
+        extracted.add_done_callback(lambda f: self._on_batch_extracted(f, batch))
+
+    def stats(self) -> Dict[str, Any]:
+        """Time spent in the stages that run off the conversion workers."""
+        with self._lock:
+            stats = {
+                'postprocess_ms': int(self._postprocess_ms),
+                'write_ms': int(self._write_ms)
+            }
+            if self.config.docling.batch_size > 1:
+                stats['batches'] = self._batches
+                stats['batch_retries'] = self._batch_retries
+            return stats
+
+    def shutdown(self) -> None:
+        # Lookups hand files on to the other stages
+        if self._lookup is not None:
+            self._lookup.shutdown(wait=True)
+        self._postprocess.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+
+    def _on_extracted(self, extracted: Future, result: Future, output_files: Dict[str, Path]) -> None:
+        """Conversion finished: queue post-processing, or fail the file."""
+        if extracted.cancelled():
+            self._finish_conversion(result, error=TaskCancelledError('conversion cancelled'))
+            return
+
+        error = extracted.exception()
+        if isinstance(error, (TaskTimeoutError, TaskCancelledError, WorkerCrashedError)):
+            self._finish_conversion(result, error=error)
+        elif error is not None:
+            self._finish_conversion(result, failure=str(error))
+        else:
+            self._finish_conversion(result, parts=extracted.result(), output_files=output_files)
+
+    def _on_batch_extracted(self, extracted: Future, batch: List[Tuple[Path, Dict[str, Path], Future]]) -> None:
+        """A batch finished: route every file on its own."""
+        error = TaskCancelledError('conversion cancelled') if extracted.cancelled() else extracted.exception()
+
+        if isinstance(error, (TaskTimeoutError, WorkerCrashedError)):
+            # One bad document can sink the whole batch; retry the files one
+            # by one so that only the culprit fails
+            with self._lock:
+                self._batch_retries += 1
+            for input_file, output_files, result in batch:
+                self._retry_single(input_file, output_files, result)
+            return
+
+        if error is not None:
+            for _, _, result in batch:
+                if isinstance(error, TaskCancelledError):
+                    self._finish_conversion(result, error=error)
+                else:
+                    self._finish_conversion(result, failure=str(error))
+            return
+
+        for (input_file, output_files, result), (ok, value) in zip(batch, extracted.result()):
+            if ok:
+                self._finish_conversion(result, parts=[value], output_files=output_files)
+            else:
+                self._finish_conversion(result, failure=value)
+
+    def _retry_single(self, input_file: Path, output_files: Dict[str, Path], result: Future) -> None:
+        try:
+            extracted = gather_futures([self.pool.submit(extract_markdown, input_file)])
+        except WorkerCrashedError as e:
+            # The pool gave up on starting its workers
+            self._finish_conversion(result, error=e)
+            return
+        except RuntimeError:
+            # Pool already shut down
+            self._finish_conversion(result, error=TaskCancelledError('conversion cancelled'))
+            return
+
+        extracted.add_done_callback(lambda f: self._on_extracted(f, result, output_files))
+
+    def _finish_conversion(
+        self,
+        result: Future,
+        parts: Optional[List[Dict[str, Any]]] = None,
+        output_files: Optional[Dict[str, Path]] = None,
+        failure: Optional[str] = None,
+        error: Optional[BaseException] = None
+    ) -> None:
+        """Leave the conversion stage with parts to post-process, a failure message or a pool error."""
+        with self._lock:
+            self._converting -= 1
+
+        if error is not None:
+            result.set_exception(error)
+        elif failure is not None:
+            # Errors raised by the conversion itself are reported like convert_pdf does
+            result_info = failed_result_info(failure)
+            result_info.pop('content')
+            result.set_result((False, result_info))
+        else:
+            self._postprocess.submit(self._run_postprocess, parts, result, output_files)
+
+    def _run_postprocess(self, parts: List[Dict[str, Any]], result: Future, output_files: Dict[str, Path]) -> None:
+        start_time = time.perf_counter()
+        try:
+            # Every format is rendered from the same exported markdown
+            success, result_info = self.converter.render_parts(parts, ','.join(output_files))
+        except Exception as e:
+            result.set_exception(e)
+            return
+        finally:
+            with self._lock:
+                self._postprocess_ms += (time.perf_counter() - start_time) * 1000
+
+        if not success:
+            result_info.pop('content', None)
+            result_info.pop('contents', None)
+            result.set_result((success, result_info))
+            return
+
+        with self._lock:
+            saved_as = self._document_files.pop(result, None)
+        if saved_as is not None:
+            document_file, task = saved_as
+            try:
+                if task.content_hash is None:
+                    task.content_hash = content_hash(task.input_file)
+                self.converter.save_parts(parts, document_file, task.content_hash)
+            except Exception as e:
+                result.set_exception(e)
+                return
+
+        self._writer.submit(self._run_write, result_info, result, output_files)
+
+    def _run_reexport(self, task: FileTask, document_file: Path, result: Future, output_files: Dict[str, Path]) -> None:
+        try:
+            if task.content_hash is None:
+                task.content_hash = content_hash(task.input_file)
+            parts = self.converter.load_parts(document_file, task.content_hash)
+        except StaleDocumentError:
+            # The input or Docling changed since it was saved: convert again and
+            # replace it, unbatched as the last batch may have been flushed
+            self._save_document(task, document_file, result)
+            self._convert(task.input_file, output_files, result, batch=False)
+            return
+        except Exception as e:
+            result_info = failed_result_info(f"saved_document_error: {str(e)}")
+            result_info.pop('content')
+            result.set_result((False, result_info))
+            return
+
+        self._run_postprocess(parts, result, output_files)
+
+    def _run_write(self, result_info: Dict[str, Any], result: Future, output_files: Dict[str, Path]) -> None:
+        start_time = time.perf_counter()
+        try:
+            content = result_info.pop('content', None)
+            contents = result_info.pop('contents', None) or {next(iter(output_files)): content}
+            for output_ext, output_file in output_files.items():
+                write_output(output_file, contents[output_ext])
+        except Exception as e:
+            result.set_exception(e)
+            return
+        finally:
+            with self._lock:
+                self._write_ms += (time.perf_counter() - start_time) * 1000
+
+        with self._lock:
+            cache_keys = self._cache_keys.pop(result, None)
+            task = self._unhashed.pop(result, None)
+        if task is not None and task.content_hash is None:
+            try:
+                task.content_hash = content_hash(task.input_file)
+            except OSError:
+                # Left for the manifest to hash, or fail on, itself
+                pass
+        if cache_keys is not None:
+            for output_ext, key in cache_keys.items():
+                self.cache.put(key, contents[output_ext], dict(result_info, char_count=len(contents[output_ext])))
+
+        result.set_result((True, result_info))
@@ -0,0 +1,504 @@
+"""Supervised worker pool with per-task deadlines."""
+
+import multiprocessing
+import pickle
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .config import Config
+from .converter import ConverterPool
+from .utils import get_rss_mb
+
+# Message sent by a worker once its converter is ready
+_READY = '__ready__'
+# Message sent by a worker once it holds a converter for its task
+_STARTED = '__started__'
+
+
+class TaskTimeoutError(Exception):
+    """Raised on a future whose task exceeded its deadline."""
+
+
+class WorkerCrashedError(Exception):
+    """Raised on a future whose worker died while running it."""
+
+
+class TaskCancelledError(Exception):
+    """Raised on a future whose task was stopped by SupervisedPool.terminate()."""
+
+
+def _worker_loop(conn: Connection, converters: ConverterPool) -> None:
+    """Run tasks received on conn until told to stop."""
+    # Warm an instance before reporting ready, so deadlines exclude model loading
+    converters.prewarm()
+    conn.send(_READY)
+
+    while True:
+        try:
+            item = conn.recv()
+        except (EOFError, OSError):
+            break
+
+        if item is None:
+            break
+
+        task_id, fn, args = item
+        try:
+            with converters.checkout() as converter:
+                # The deadline runs from here, not from the wait for a shared converter
+                try:
+                    conn.send(_STARTED)
+                except (BrokenPipeError, OSError):
+                    # The parent abandoned this worker
+                    break
+                message = (task_id, True, fn(converter, *args))
+        except Exception as e:
+            message = (task_id, False, _picklable_error(e))
+
+        try:
+            conn.send(message + (get_rss_mb(),))
+        except (BrokenPipeError, OSError):
+            # The parent abandoned this worker
+            break
+
+
+def _picklable_error(error: Exception) -> Exception:
+    """Return error, or a RuntimeError carrying its message if it cannot be pickled."""
+    try:
+        pickle.dumps(error)
+        return error
+    except Exception:
+        return RuntimeError(str(error))
+
+
+def _process_worker_main(conn: Connection, config: Config) -> None:
+    """Entry point of a worker process: build a warm converter and serve tasks."""
+    # Shutdown signals are handled by the parent process
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    _worker_loop(conn, ConverterPool(config, size=1))
+
+
+def gather_futures(futures: List[Future]) -> Future:
+    """
+    Combine futures into one resolving to their results in order.
+
+    The first failure fails the combined future and cancels the parts that
+    have not started yet.
+    """
+    combined = Future()
+    results = [None] * len(futures)
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def on_done(index: int, future: Future) -> None:
+        with lock:
+            if combined.done():
+                return
+
+            if future.cancelled() or future.exception() is not None:
+                error = future.exception() if not future.cancelled() else TaskCancelledError('part cancelled')
+                combined.set_exception(error)
+                for other in futures:
+                    other.cancel()
+                return
+
+            results[index] = future.result()
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                combined.set_result(results)
+
+    combined.set_running_or_notify_cancel()
+    for index, future in enumerate(futures):
+        future.add_done_callback(lambda f, i=index: on_done(i, f))
+
+    return combined
+
+
+class _Worker:
+    """Parent-side handle of one worker thread or process."""
+
+    def __init__(self, conn: Connection, handle, is_process: bool):
+        self.conn = conn
+        self.handle = handle
+        self.is_process = is_process
+        self.ready = False
+        self.work_item: Optional[Tuple[Future, Callable, tuple, Optional[float]]] = None
+        self.deadline: Optional[float] = None
+        self.files_done = 0
+        self.rss_mb = 0.0
+
+    @property
+    def idle(self) -> bool:
+        return self.ready and self.work_item is None
+
+    def stop(self) -> None:
+        """Ask the worker to exit after its current task."""
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+
+    def kill(self) -> None:
+        """Terminate the worker immediately.
+
+        Threads cannot be killed, so a stuck thread is abandoned instead: its
+        pipe is closed and it exits as soon as its current call returns.
+        """
+        if self.is_process:
+            self.handle.kill()
+            self.handle.join()
+        self.conn.close()
+
+    def join(self) -> None:
+        self.handle.join()
+        self.conn.close()
+
+
+class SupervisedPool(Executor):
+    """
+    Executor running conversion tasks on supervised workers.
+
+    Each worker holds a converter and runs ``fn(converter, *args)`` for every
+    submitted task. A supervisor thread dispatches tasks, enforces the per-task
+    deadline and replaces workers that time out or crash, so a stuck file
+    never takes a worker slot away from the rest of the run.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        max_workers: int,
+        executor: str = 'thread',
+        task_timeout: Optional[float] = None,
+        on_event: Optional[Callable[..., None]] = None
+    ):
+        self.config = config
+        self.max_workers = max_workers
+        self._target_size = max_workers
+        self.executor = executor
+        self.task_timeout = task_timeout if task_timeout and task_timeout > 0 else None
+        # Thread workers check out converters from a pool shared in this process
+        self._converters = ConverterPool(config, size=config.docling.converter_instances)
+        self._on_event = on_event
+
+        self._mp_context = multiprocessing.get_context('spawn')
+        self._pending: Deque[Tuple[Future, Callable, tuple, Optional[float]]] = deque()
+        self._workers: List[_Worker] = []
+        self._retired: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self._terminating = False
+        # Why the pool stopped on its own, raised to tasks submitted after it
+        self._failure: Optional[Exception] = None
+        self._next_task_id = 0
+        self._startup_failures = 0
+        self._wakeup_r, self._wakeup_w = multiprocessing.Pipe(duplex=False)
+
+        for _ in range(max_workers):
+            self._workers.append(self._spawn_worker())
+
+        self._supervisor = threading.Thread(target=self._supervise, name='pdf2docs-supervisor', daemon=True)
+        self._supervisor.start()
+
+    def submit(self, fn: Callable, /, *args) -> Future:
+        """Schedule fn(converter, *args) on the next free worker."""
+        return self.submit_with_timeout(self.task_timeout, fn, *args)
+
+    def submit_with_timeout(self, timeout: Optional[float], fn: Callable, /, *args) -> Future:
+        """Like submit(), with a deadline of its own instead of the pool's task_timeout."""
+        with self._lock:
+            if self._failure is not None:
+                raise self._failure
+            if self._shutdown:
+                raise RuntimeError('cannot schedule new tasks after shutdown')
+
+            future = Future()
+            self._pending.append((future, fn, args, timeout if timeout and timeout > 0 else None))
+
+        self._wakeup()
+        return future
+
+    @property
+    def size(self) -> int:
+        """Number of workers the pool is running or scaling towards."""
+        return self._target_size
+
+    def resize(self, size: int) -> None:
+        """Grow or shrink the pool; surplus workers stop after their current task."""
+        self._target_size = max(1, size)
+        self._wakeup()
+
+    def converter_stats(self) -> Optional[Dict[str, Any]]:
+        """Checkout and wait metrics of the thread workers' converters."""
+        if self.executor == 'process':
+            return None
+        return self._converters.stats()
+
+    def total_rss_mb(self) -> float:
+        """Resident memory of the parent plus every worker process."""
+        return get_rss_mb() + sum(worker.rss_mb for worker in self._workers if worker.is_process)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """Stop accepting tasks and stop the workers once queued work is done."""
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                while self._pending:
+                    future = self._pending.popleft()[0]
+                    future.cancel()
+
+        self._wakeup()
+        if wait:
+            self._supervisor.join()
+
+    def terminate(self) -> None:
+        """Kill every worker now; running tasks fail with TaskCancelledError and queued ones are cancelled."""
+        with self._lock:
+            self._shutdown = True
+            self._terminating = True
+
+        self._wakeup()
+        self._supervisor.join()
+
+    def _wakeup(self) -> None:
+        try:
+            self._wakeup_w.send(None)
+        except OSError:
+            pass
+
+    def _spawn_worker(self) -> _Worker:
+        """Start a new worker with its own end of a pipe."""
+        parent_conn, child_conn = multiprocessing.Pipe()
+
+        if self.executor == 'process':
+            handle = self._mp_context.Process(
+                target=_process_worker_main,
+                args=(child_conn, self.config),
+                daemon=True
+            )
+            handle.start()
+            child_conn.close()
+            return _Worker(parent_conn, handle, is_process=True)
+
+        handle = threading.Thread(
+            target=_worker_loop,
+            args=(child_conn, self._converters),
+            daemon=True
+        )
+        handle.start()
+        return _Worker(parent_conn, handle, is_process=False)
+
+    def _replace_worker(self, worker: _Worker, reason: str) -> None:
+        """Kill a worker and start a fresh one in its slot."""
+        worker.kill()
+        if not worker.is_process:
+            # The abandoned thread keeps running its call; its converter must not hold up the others
+            self._converters.discard(worker.handle.ident)
+        replacement = self._spawn_worker()
+        self._workers[self._workers.index(worker)] = replacement
+
+        if self._on_event:
+            self._on_event("Worker replaced", reason=reason, executor=self.executor)
+
+    def _retire_worker(self, worker: _Worker, reason: str) -> None:
+        """Stop an idle worker gracefully and start a fresh one in its slot."""
+        worker.stop()
+        self._reap_retired()
+        self._retired.append(worker)
+        self._workers[self._workers.index(worker)] = self._spawn_worker()
+
+        if self._on_event:
+            self._on_event(
+                "Worker recycled",
+                reason=reason,
+                files_done=worker.files_done,
+                rss_mb=round(worker.rss_mb, 1)
+            )
+
+    def _reap_retired(self) -> None:
+        """Join workers retired earlier that have exited since."""
+        for retired in [w for w in self._retired if not w.handle.is_alive()]:
+            retired.join()
+            self._retired.remove(retired)
+
+    def _apply_target_size(self) -> None:
+        """Start or stop workers to match the size set by resize()."""
+        while len(self._workers) < self._target_size:
+            self._workers.append(self._spawn_worker())
+
+        surplus = len(self._workers) - self._target_size
+        if surplus <= 0:
+            return
+
+        self._reap_retired()
+        for worker in [w for w in self._workers if w.work_item is None][:surplus]:
+            worker.stop()
+            self._workers.remove(worker)
+            self._retired.append(worker)
+
+    def _recycle_reason(self, worker: _Worker) -> Optional[str]:
+        """Return why a worker should be recycled, if it crossed a limit."""
+        # RSS and file counts are per process; thread workers share both
+        if not worker.is_process:
+            return None
+
+        limits = self.config.limits
+        if limits.max_files_per_worker and worker.files_done >= limits.max_files_per_worker:
+            return 'max_files_per_worker'
+        if limits.max_worker_rss_mb and worker.rss_mb >= limits.max_worker_rss_mb:
+            return 'max_worker_rss_mb'
+        return None
+
+    def _supervise(self) -> None:
+        """Dispatch tasks, collect results and enforce deadlines until shutdown."""
+        while True:
+            if self._terminating:
+                self._kill_all()
+                return
+
+            self._apply_target_size()
+            self._dispatch()
+
+            with self._lock:
+                finished = self._shutdown and not self._pending
+            if finished and all(worker.work_item is None for worker in self._workers):
+                break
+
+            conns = [worker.conn for worker in self._workers] + [self._wakeup_r]
+            for conn in wait(conns, timeout=self._time_to_next_deadline()):
+                if conn is self._wakeup_r:
+                    while self._wakeup_r.poll():
+                        self._wakeup_r.recv()
+                    continue
+
+                worker = next(w for w in self._workers if w.conn is conn)
+                self._receive(worker)
+
+            self._enforce_deadlines()
+
+        for worker in self._workers:
+            worker.stop()
+        for worker in self._workers + self._retired:
+            if worker.work_item is None:
+                worker.join()
+
+    def _kill_all(self) -> None:
+        """Kill all workers and fail or cancel every unfinished task."""
+        with self._lock:
+            while self._pending:
+                future = self._pending.popleft()[0]
+                future.cancel()
+
+        for worker in self._workers + self._retired:
+            if worker.work_item:
+                worker.work_item[0].set_exception(TaskCancelledError('worker terminated'))
+                worker.work_item = None
+            worker.kill()
+
+        self._workers = []
+        self._retired = []
+
+    def _dispatch(self) -> None:
+        """Hand pending tasks to idle workers."""
+        for worker in self._workers:
+            if not worker.idle:
+                continue
+
+            with self._lock:
+                work_item = None
+                while self._pending:
+                    candidate = self._pending.popleft()
+                    if candidate[0].set_running_or_notify_cancel():
+                        work_item = candidate
+                        break
+
+            if work_item is None:
+                return
+
+            _, fn, args, _ = work_item
+            task_id = self._next_task_id
+            self._next_task_id += 1
+
+            # The deadline is set once the worker reports the task started
+            worker.work_item = work_item
+            worker.deadline = None
+            worker.conn.send((task_id, fn, args))
+
+    def _receive(self, worker: _Worker) -> None:
+        """Handle one message from a worker."""
+        try:
+            message = worker.conn.recv()
+        except (EOFError, OSError):
+            # The worker died: fail its task and start a replacement
+            if worker.work_item:
+                worker.work_item[0].set_exception(WorkerCrashedError('worker exited unexpectedly'))
+                worker.work_item = None
+
+            if not worker.ready:
+                self._startup_failures += 1
+                if self._startup_failures > len(self._workers):
+                    self._fail_pending(WorkerCrashedError('workers fail to start'))
+
+            self._replace_worker(worker, reason='crashed')
+            return
+
+        if message == _READY:
+            worker.ready = True
+            self._startup_failures = 0
+            return
+
+        if message == _STARTED:
+            timeout = worker.work_item[3]
+            worker.deadline = time.monotonic() + timeout if timeout else None
+            return
+
+        _, ok, value, worker.rss_mb = message
+        future = worker.work_item[0]
+        worker.work_item = None
+        worker.deadline = None
+        worker.files_done += 1
+
+        if ok:
+            future.set_result(value)
+        else:
+            future.set_exception(value)
+
+        reason = self._recycle_reason(worker)
+        if reason:
+            self._retire_worker(worker, reason)
+
+    def _fail_pending(self, error: Exception) -> None:
+        """Fail every queued task and refuse new ones with the same error."""
+        with self._lock:
+            self._shutdown = True
+            self._failure = error
+            while self._pending:
+                future = self._pending.popleft()[0]
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(error)
+
+    def _time_to_next_deadline(self) -> Optional[float]:
+        deadlines = [worker.deadline for worker in self._workers if worker.deadline is not None]
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - time.monotonic())
+
+    def _enforce_deadlines(self) -> None:
+        """Fail overdue tasks and replace the workers running them."""
+        now = time.monotonic()
+
+        for worker in list(self._workers):
+            if worker.deadline is None or worker.deadline > now:
+                continue
+
+            future, _, _, timeout = worker.work_item
+            worker.work_item = None
+            worker.deadline = None
+            future.set_exception(TaskTimeoutError(f"exceeded {timeout}s"))
+            self._replace_worker(worker, reason='timeout')
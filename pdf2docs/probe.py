@@ -0,0 +1,181 @@
+"""Cheap PDF probes and text-layer extraction that run without the model pipeline."""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+
+@dataclass
+class TextLayerProbe:
+    pages_total: int
+    pages_sampled: int
+    pages_with_text: int
+    char_count: int
+
+    @property
+    def has_text(self) -> bool:
+        return self.char_count > 0
+
+
+@dataclass
+class LayoutProbe:
+    pages_sampled: int
+    chars_per_page: float
+    paths_per_page: float
+    images_per_page: float
+    columns: int
+
+
+def _sample_page_indexes(pages_total: int, sample_pages: int) -> List[int]:
+    """Up to sample_pages 0-based page indexes spread evenly from first to last page."""
+    if pages_total <= sample_pages:
+        return list(range(pages_total))
+    if sample_pages == 1:
+        return [0]
+
+    step = (pages_total - 1) / (sample_pages - 1)
+    return sorted({round(i * step) for i in range(sample_pages)})
+
+
+def probe_text_layer(source: Union[Path, bytes], sample_pages: int = 5) -> Optional[TextLayerProbe]:
+    """
+    Sample the embedded text layer of a PDF with pypdfium2.
+
+    Takes milliseconds and loads no models. Scanned PDFs have no text layer,
+    and conversion runs without OCR, so a PDF whose sampled pages have no
+    text would convert to nothing.
+
+    Returns:
+        The probe result, or None if the PDF cannot be read this way
+    """
+    try:
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(str(source) if isinstance(source, Path) else source)
+    except Exception:
+        return None
+
+    try:
+        pages_total = len(pdf)
+        indexes = _sample_page_indexes(pages_total, sample_pages)
+
+        pages_with_text = 0
+        char_count = 0
+        for index in indexes:
+            page = pdf[index]
+            textpage = page.get_textpage()
+            try:
+                chars = sum(1 for char in textpage.get_text_range() if not char.isspace())
+            finally:
+                textpage.close()
+                page.close()
+
+            if chars:
+                pages_with_text += 1
+                char_count += chars
+
+        return TextLayerProbe(
+            pages_total=pages_total,
+            pages_sampled=len(indexes),
+            pages_with_text=pages_with_text,
+            char_count=char_count
+        )
+    except Exception:
+        return None
+    finally:
+        pdf.close()
+
+
+def _estimate_columns(rects: List[Tuple[float, float, float, float]], page_width: float) -> int:
+    """1 or 2 text columns, from how text runs sit relative to the middle of the page."""
+    if len(rects) < 4 or page_width <= 0:
+        return 1
+
+    middle = page_width / 2
+    left = sum(1 for x0, _, x1, _ in rects if x1 < middle)
+    right = sum(1 for x0, _, x1, _ in rects if x0 > middle)
+    spanning = len(rects) - left - right
+
+    # Two columns: both halves well used and few lines crossing the gutter
+    if left >= len(rects) * 0.25 and right >= len(rects) * 0.25 and spanning <= len(rects) * 0.2:
+        return 2
+    return 1
+
+
+def probe_layout(source: Union[Path, bytes], sample_pages: int = 5) -> Optional[LayoutProbe]:
+    """
+    Measure what makes a PDF expensive to convert: text density, vector paths
+    (ruling lines of tables, drawings), images and text columns.
+
+    Returns:
+        Per-page averages over the sampled pages, or None if the PDF cannot be read
+    """
+    try:
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(str(source) if isinstance(source, Path) else source)
+    except Exception:
+        return None
+
+    try:
+        indexes = _sample_page_indexes(len(pdf), sample_pages)
+        if not indexes:
+            return None
+
+        chars = paths = images = 0
+        columns = 1
+        for index in indexes:
+            page = pdf[index]
+            textpage = page.get_textpage()
+            try:
+                chars += sum(1 for char in textpage.get_text_range() if not char.isspace())
+                rects = [textpage.get_rect(i) for i in range(textpage.count_rects())]
+                columns = max(columns, _estimate_columns(rects, page.get_width()))
+
+                for obj in page.get_objects(filter=[pdfium.raw.FPDF_PAGEOBJ_PATH, pdfium.raw.FPDF_PAGEOBJ_IMAGE]):
+                    if obj.type == pdfium.raw.FPDF_PAGEOBJ_PATH:
+                        paths += 1
+                    else:
+                        images += 1
+            finally:
+                textpage.close()
+                page.close()
+
+        sampled = len(indexes)
+        return LayoutProbe(
+            pages_sampled=sampled,
+            chars_per_page=chars / sampled,
+            paths_per_page=paths / sampled,
+            images_per_page=images / sampled,
+            columns=columns
+        )
+    except Exception:
+        return None
+    finally:
+        pdf.close()
+
+
+def extract_text_layer(source: Union[Path, bytes], max_pages: int = 0) -> Optional[List[str]]:
+    """Text of every page, or the first max_pages, from the embedded text layer; None if the PDF cannot be read."""
+    try:
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(str(source) if isinstance(source, Path) else source)
+    except Exception:
+        return None
+
+    try:
+        pages = []
+        for index in range(min(len(pdf), max_pages) if max_pages else len(pdf)):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            try:
+                pages.append(textpage.get_text_range().replace('\r\n', '\n').strip())
+            finally:
+                textpage.close()
+                page.close()
+        return pages
+    except Exception:
+        return None
+    finally:
+        pdf.close()
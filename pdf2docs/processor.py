@@ -1,44 +1,147 @@
 """Main processing engine with parallelization and progress tracking."""
 
+import asyncio
+import itertools
+import queue
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, FIRST_COMPLETED, wait
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, Any, AsyncIterator, BinaryIO, Callable, Iterable, Iterator, List, Optional, Set, Tuple, Union
 import signal
 import sys
 
-from tqdm import tqdm
-
+from .autoscale import WorkerAutoscaler, resolve_max_workers
+from .cache import ConversionCache
 from .config import Config
-from .converter import PDFConverter
+from .converter import PDFConverter, failed_result_info
+from .journal import RunJournal
 from .logger import StructuredLogger
+from .manifest import OutputManifest
+from .pipeline import ConversionPipeline
+from .probe import TextLayerProbe, probe_text_layer
+from .tasks import FileTask
+from .pool import SupervisedPool, TaskCancelledError, TaskTimeoutError
+from .workers import convert_source
 from .utils import (
     detect_language_from_path,
-    resolve_output_path,
+    find_language_dirs,
+    resolve_output_paths,
+    sibling_output_paths,
+    resolve_document_path,
     ensure_directories_exist,
-    get_file_size_mb,
+    get_pdf_page_count,
+    estimate_conversion_cost,
     validate_pdf_file,
     find_pdf_files,
+    iter_pdf_files,
     get_skip_reason
 )
 
+# Tasks submitted ahead of the workers: enough to keep them busy, small enough
+# that memory does not grow with the number of queued files
+_TASKS_IN_FLIGHT_PER_WORKER = 2
+
+# How often the result loop wakes up to check for shutdown signals
+_POLL_INTERVAL_SEC = 0.5
+
+# How often it looks for newly discovered files while workers have room for them
+_DISCOVERY_POLL_INTERVAL_SEC = 0.05
+
+
+class _Discovery:
+    """
+    Runs the scan and checks of a streaming run on their own thread.
+
+    Tasks reach the result loop through a bounded queue, so a slow folder or
+    PDF check never holds up results, progress or a shutdown.
+    """
+
+    def __init__(self, file_tasks: Iterator[FileTask], maxsize: int):
+        self._tasks: queue.Queue = queue.Queue(maxsize)
+        self._stopping = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(file_tasks,),
+            name="pdf2docs-discovery",
+            daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, file_tasks: Iterator[FileTask]) -> None:
+        try:
+            for task in file_tasks:
+                while not self._stopping.is_set():
+                    try:
+                        self._tasks.put(task, timeout=_POLL_INTERVAL_SEC)
+                        break
+                    except queue.Full:
+                        continue
+                if self._stopping.is_set():
+                    # The scan stays unfinished in the journal for --resume
+                    return
+        except Exception as e:
+            self._error = e
+
+    def get(self, timeout: float = 0) -> Optional[FileTask]:
+        """Next discovered task, or None if there is none within timeout."""
+        try:
+            return self._tasks.get(timeout=timeout) if timeout else self._tasks.get_nowait()
+        except queue.Empty:
+            return None
+
+    def finished(self) -> bool:
+        """Whether every task was handed over; an error that ended the scan is raised here."""
+        if self._thread.is_alive() or not self._tasks.empty():
+            return False
+        if self._error is not None:
+            raise self._error
+        return True
+
+    def stop(self) -> None:
+        """Stop after the file being checked; the journal must stay open until then."""
+        self._stopping.set()
+        self._thread.join()
+
 
 class PDFProcessor:
     """Main processing engine for PDF conversion."""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, install_signal_handlers: bool = True):
         self.config = config
         self.logger = StructuredLogger(config.logging)
         self.converter = PDFConverter(config)
         self._cancelled = False
-
-        # Set up signal handlers for graceful shutdown
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        self._force_stop = False
+        self._autoscaler: Optional[WorkerAutoscaler] = None
+        self._shared_pool: Optional[SupervisedPool] = None
+        self._engine_stats: Dict[str, int] = {}
+        self.journal: Optional[RunJournal] = None
+        self.manifest: Optional[OutputManifest] = None
+
+        # Set up signal handlers for graceful shutdown; applications embedding
+        # the processor keep their own
+        if install_signal_handlers:
+            signal.signal(signal.SIGINT, self._signal_handler)
+            signal.signal(signal.SIGTERM, self._signal_handler)
+
+    @property
+    def interrupted(self) -> bool:
+        """Whether a shutdown signal stopped the run before every file was processed."""
+        return self._cancelled
 
     def _signal_handler(self, signum, frame):
-        """Handle shutdown signals gracefully."""
-        print("\nShutdown signal received. Finishing current tasks...")
+        """Handle shutdown signals gracefully; a second signal stops immediately."""
+        if self._cancelled:
+            print("\nSecond shutdown signal received. Stopping now...")
+            self._force_stop = True
+            return
+
+        print(
+            f"\nShutdown signal received. Finishing current tasks "
+            f"(up to {self.config.limits.drain_timeout_sec}s, signal again to stop now)..."
+        )
         self._cancelled = True
 
     def process(
@@ -46,102 +149,514 @@ class PDFProcessor:
         input_path: Path,
         output_ext: str,
         language_override: Optional[str] = None,
-        pattern: Optional[str] = None
+        pattern: Optional[str] = None,
+        reexport: bool = False,
+        recursive: bool = False
     ) -> bool:
         """
         Main processing function.
 
+        output_ext may name several formats, e.g. "txt,md", which are all
+        written from a single conversion of each file.
+
+        With recursive, subfolders are converted too, each into the same
+        subfolder of the results.
+
+        With the fifo schedule, files are checked and converted as the scan
+        finds them; other schedules need every file known up front.
+
+        With reexport, only files with a saved DoclingDocument are processed,
+        and their outputs are regenerated from it even if they exist.
+
         Returns:
             bool: True if processing completed successfully, False if errors occurred
         """
         try:
-            # Detect language
-            if language_override:
-                language = language_override
-            else:
-                language = detect_language_from_path(input_path)
-                if not language:
-                    self.logger.log_error(
-                        f"Cannot determine language from path: {input_path}. "
-                        f"Use --lang to specify language."
+            self._open_journal()
+            self._open_manifest()
+
+            language_dirs = self._language_dirs(input_path, language_override)
+            if not language_dirs:
+                return False
+
+            if self.config.logging.schedule == 'fifo':
+                # Recorded so that --resume can finish the scan if this run is cut short
+                scan_id = None
+                if self.journal:
+                    scan_id = self.journal.start_scan(
+                        input_path, output_ext, language_override, pattern, recursive, reexport
                     )
-                    return False
+                file_tasks = self._discover_tasks(
+                    input_path, language_dirs, output_ext, pattern, recursive, reexport, scan_id
+                )
+
+                # Only start the workers once there is something to convert
+                first_task = next(file_tasks, None)
+                if first_task is None:
+                    self.logger.log_info("No files to process after validation")
+                    self.logger.print_summary()
+                    return True
+
+                return self._run_tasks(itertools.chain([first_task], file_tasks))
 
             # Find PDF files
-            pdf_files = find_pdf_files(input_path, pattern)
-            if not pdf_files:
+            pdf_files_by_language = [
+                (language, language_path, find_pdf_files(language_path, pattern, recursive))
+                for language, language_path in language_dirs
+            ]
+            total_found = sum(len(pdf_files) for _, _, pdf_files in pdf_files_by_language)
+            if not total_found:
                 self.logger.log_info(f"No PDF files found in {input_path}")
                 return True
 
-            self.logger.log_info(f"Found {len(pdf_files)} PDF files to process")
-
-            # Ensure output directories exist
-            output_dirs = [Path("data/result") / language]
-            ensure_directories_exist(output_dirs)
+            self.logger.log_info(f"Found {total_found} PDF files to process")
+            if len(language_dirs) > 1:
+                self.logger.add_summary_stats('languages', {
+                    language: len(pdf_files) for language, _, pdf_files in pdf_files_by_language
+                })
 
             # Prepare file list with validation
             file_tasks = []
-            for pdf_file in pdf_files:
-                output_path = resolve_output_path(pdf_file, language, output_ext)
-                file_size_mb = get_file_size_mb(pdf_file)
-
-                # Check if file should be skipped
-                skip_reason = get_skip_reason(
-                    output_path,
-                    file_size_mb,
-                    self.config.limits.max_file_size_mb
-                )
+            for language, language_path, pdf_files in pdf_files_by_language:
+                if pdf_files:
+                    # Ensure output directories exist
+                    ensure_directories_exist([Path("data/result") / language])
+                    root = language_path if recursive else None
+                    file_tasks.extend(self._prepare_tasks(pdf_files, language, output_ext, reexport, root))
 
-                if skip_reason:
-                    # Log skip
-                    self.logger.log_skip(
-                        pdf_file,
-                        output_path,
-                        language,
-                        skip_reason,
-                        int(pdf_file.stat().st_size)
-                    )
-                    continue
+            if not file_tasks:
+                self.logger.log_info("No files to process after validation")
+                self.logger.print_summary()
+                return True
 
-                # Validate PDF file
-                is_valid, reason = validate_pdf_file(pdf_file)
-                if not is_valid:
-                    self.logger.log_skip(
-                        pdf_file,
-                        output_path,
-                        language,
-                        f"invalid_pdf_{reason}",
-                        int(pdf_file.stat().st_size)
-                    )
+            if self.journal:
+                self.journal.enqueue(file_tasks)
+
+            return self._run_tasks(file_tasks)
+
+        except Exception as e:
+            self.logger.log_error(f"Processing failed: {e}")
+            return False
+
+        finally:
+            self._close_journal()
+            self._close_manifest()
+
+    def _discover_tasks(
+        self,
+        input_path: Path,
+        language_dirs: List[Tuple[str, Path]],
+        output_ext: str,
+        pattern: Optional[str],
+        recursive: bool,
+        reexport: bool,
+        scan_id: Optional[int] = None,
+        is_known: Optional[Callable[[Path], bool]] = None
+    ) -> Iterator[FileTask]:
+        """
+        Yield tasks while the input folders are still being scanned.
+
+        Each file is checked and journaled when it is found, so the first
+        conversions start right away and the checks of later files run while
+        the workers convert earlier ones.
+
+        The journaled scan scan_id is marked finished once the whole input has
+        been scanned. Files for which is_known returns True are passed over;
+        a resumed scan uses it to skip what the interrupted run already found.
+        """
+        found: Dict[str, int] = {}
+        for language, language_path in language_dirs:
+            ensure_directories_exist([Path("data/result") / language])
+            root = language_path if recursive else None
+            found[language] = 0
+
+            for pdf_file in iter_pdf_files(language_path, pattern, recursive, on_error=self._log_scan_error):
+                if is_known is not None and is_known(pdf_file):
                     continue
+                found[language] += 1
+                for task in self._prepare_tasks([pdf_file], language, output_ext, reexport, root):
+                    if self.journal:
+                        self.journal.enqueue([task])
+                    yield task
+
+        total_found = sum(found.values())
+        if not total_found:
+            self.logger.log_info(f"No PDF files found in {input_path}")
+        else:
+            self.logger.log_info(f"Found {total_found} PDF files")
+        if len(language_dirs) > 1:
+            self.logger.add_summary_stats('languages', found)
+
+        if scan_id is not None and self.journal:
+            self.journal.finish_scan(scan_id)
+
+    def _continue_scan(self, scan: dict, known_files: Set[str]) -> Iterator[FileTask]:
+        """Finish a scan an interrupted run did not complete, skipping files it already found."""
+        self.logger.log_info(f"Continuing the interrupted scan of {scan['input_path']}")
+        language_dirs = self._language_dirs(scan['input_path'], scan['language'])
+        if not language_dirs:
+            # Input moved or renamed since; nothing left to scan
+            self.journal.finish_scan(scan['id'])
+            return
+
+        def is_known(pdf_file: Path) -> bool:
+            return str(pdf_file) in known_files or self.journal.seen_since(pdf_file, scan['started_at'])
+
+        yield from self._discover_tasks(
+            scan['input_path'], language_dirs, scan['output_ext'], scan['pattern'],
+            scan['recursive'], scan['reexport'], scan['id'], is_known
+        )
+
+    def _language_dirs(self, input_path: Path, language_override: Optional[str]) -> Optional[List[Tuple[str, Path]]]:
+        """
+        Detect the language of the input; a raw data root such as data/raw is
+        split into its language folders, all converted on the same pool.
+
+        Returns None, after logging why, if no language can be determined.
+        """
+        if language_override:
+            return [(language_override, input_path)]
+
+        language = detect_language_from_path(input_path)
+        language_dirs = [(language, input_path)] if language else find_language_dirs(input_path)
+        if not language_dirs:
+            self.logger.log_error(
+                f"Cannot determine language from path: {input_path}. "
+                f"Use --lang to specify language."
+            )
+            return None
+        return language_dirs
 
-                file_tasks.append((pdf_file, output_path, language, output_ext))
+    def _log_scan_error(self, error: OSError) -> None:
+        self.logger.log_error(f"Cannot scan {error.filename}: {error.strerror}")
 
-            if not file_tasks:
+    def resume(self) -> bool:
+        """
+        Restart the unfinished work recorded in the run journal.
+
+        Files left queued or running by an interrupted run are converted again,
+        as are failed files with fewer than journal.max_attempts attempts.
+        A streaming (fifo) scan the interrupted run did not complete is
+        continued, and the files it had not reached yet are converted too.
+
+        Returns:
+            bool: True if processing completed successfully, False if errors occurred
+        """
+        try:
+            self._open_journal()
+            self._open_manifest()
+            if not self.journal:
+                self.logger.log_error("Cannot resume: the run journal is disabled (journal.enabled)")
+                return False
+
+            file_tasks = self.journal.unfinished(self.config.journal.max_attempts)
+            self.logger.log_info(f"Resuming {len(file_tasks)} unfinished files from {self.journal.db_path}")
+
+            scans = self.journal.unfinished_scans()
+            if not scans:
+                if not file_tasks:
+                    self.logger.print_summary()
+                    return True
+
+                return self._run_tasks(file_tasks)
+
+            known_files = {str(task.input_file) for task in file_tasks}
+            all_tasks = itertools.chain(file_tasks, *(self._continue_scan(scan, known_files) for scan in scans))
+
+            first_task = next(all_tasks, None)
+            if first_task is None:
                 self.logger.log_info("No files to process after validation")
                 self.logger.print_summary()
                 return True
 
-            # Process files
-            success = self._process_files_parallel(file_tasks)
-
-            # Print summary
-            self.logger.print_summary()
-
-            return success
+            return self._run_tasks(itertools.chain([first_task], all_tasks))
 
         except Exception as e:
             self.logger.log_error(f"Processing failed: {e}")
             return False
 
-    def _process_files_parallel(self, file_tasks: List[Tuple[Path, Path, str, str]]) -> bool:
+        finally:
+            self._close_journal()
+            self._close_manifest()
+
+    def _prepare_tasks(
+        self,
+        pdf_files: List[Path],
+        language: str,
+        output_ext: str,
+        reexport: bool = False,
+        root: Optional[Path] = None
+    ) -> List[FileTask]:
+        """
+        Turn discovered files into tasks, logging the ones that are skipped.
+
+        Each file is stat'ed once here; the checks below and everything
+        downstream use the size and mtime kept in its FileTask.
+
+        Given the root of a recursive scan, outputs go to the subfolder of the
+        results matching the file's subfolder below root.
+        """
+        file_tasks = []
+        for pdf_file in pdf_files:
+            relative_dir = pdf_file.parent.relative_to(root) if root is not None else None
+            output_paths = resolve_output_paths(pdf_file, language, output_ext, relative_dir)
+            task = FileTask(pdf_file, next(iter(output_paths.values())), language, output_ext)
+
+            if reexport:
+                # Existing outputs are regenerated; files never saved are left alone
+                if not resolve_document_path(task.output_file, self.config.documents.dir).exists():
+                    self._skip_task(task, 'no_saved_document')
+                    continue
+
+                file_tasks.append(task)
+                continue
+
+            # Only the formats whose output is missing or outdated are produced
+            pending_exts = [ext for ext, path in output_paths.items() if not self._output_is_current(path, task)]
+            if pending_exts:
+                task.output_file = output_paths[pending_exts[0]]
+
+            # Check if file should be skipped
+            skip_reason = get_skip_reason(
+                [output_paths[ext] for ext in pending_exts],
+                task.size / (1024 * 1024),
+                self.config.limits.max_file_size_mb
+            )
+
+            if skip_reason:
+                self._skip_task(task, skip_reason)
+                continue
+
+            task.output_ext = ','.join(pending_exts)
+
+            # Validate PDF file
+            is_valid, reason = validate_pdf_file(pdf_file, task.size)
+            if not is_valid:
+                self._skip_task(task, f"invalid_pdf_{reason}")
+                continue
+
+            # The PDF is opened once, after the cheaper checks, for both its
+            # page count and a sample of its text layer
+            probe = None
+            if self.config.limits.text_probe_pages > 0:
+                probe = probe_text_layer(pdf_file, self.config.limits.text_probe_pages)
+                if probe is not None:
+                    # Kept for the ljf/sjf schedules, which would open the PDF again
+                    task.pages = probe.pages_total
+
+            if self._exceeds_max_pages(pdf_file, probe):
+                self._skip_task(task, 'limit_exceeded_pages')
+                continue
+
+            # Scanned PDFs convert to nothing without OCR; catch them before the models do
+            if probe is not None and not probe.has_text:
+                self._skip_task(task, 'image_only_pdf')
+                continue
+
+            file_tasks.append(task)
+
+        return file_tasks
+
+    def _skip_task(self, task: FileTask, reason: str) -> None:
+        """Log and journal a file skipped before conversion."""
+        self.logger.log_skip(task.input_file, task.output_file, task.language, reason, task.size)
+        self._journal_skip(task, reason)
+
+    def _output_is_current(self, output_path: Path, task: FileTask) -> bool:
+        """Whether an output exists and, per the manifest, its input and the pipeline are unchanged since."""
+        if not output_path.exists():
+            return False
+
+        if self.manifest:
+            stale_reason = self.manifest.stale_reason(output_path, task)
+            if stale_reason:
+                self.logger.log_info(
+                    "Reconverting outdated output",
+                    input_file=str(task.input_file),
+                    output_file=str(output_path),
+                    reason=stale_reason
+                )
+                return False
+
+        return True
+
+    def _exceeds_max_pages(self, pdf_file: Path, probe: Optional[TextLayerProbe] = None) -> bool:
+        """
+        Whether a PDF has more pages than limits.max_pages and is not converted truncated.
+
+        The page count of the text-layer probe is used when the probe ran;
+        the PDF is only opened again for it when the probe is disabled.
+        """
+        limits = self.config.limits
+        if not limits.max_pages or limits.truncate_to_max_pages:
+            return False
+
+        if probe is not None:
+            page_count = probe.pages_total
+        elif limits.text_probe_pages > 0:
+            # The probe could not read the PDF; neither can a page count
+            return False
+        else:
+            page_count = get_pdf_page_count(pdf_file)
+        return page_count is not None and page_count > limits.max_pages
+
+    def _run_tasks(self, file_tasks: Iterable[FileTask]) -> bool:
+        """Schedule, convert and summarize prepared tasks; tasks still being discovered are converted in order."""
+        # Order files by the scheduling policy
+        if isinstance(file_tasks, list):
+            file_tasks = self._schedule_tasks(file_tasks)
+
+        # Process files
+        success = self._process_files_parallel(file_tasks)
+
+        # Print summary
+        self.logger.print_summary()
+
+        return success
+
+    def _open_journal(self) -> None:
+        if self.config.journal.enabled:
+            self.journal = RunJournal(Path(self.config.journal.path))
+
+    def _journal_skip(self, task: FileTask, reason: str) -> None:
+        if self.journal:
+            self.journal.record_skip(task, reason)
+
+    def _journal_finished(self, task: FileTask, state: str, error_reason: Optional[str] = None) -> None:
+        if self.journal:
+            self.journal.mark_finished(task.input_file, state, error_reason)
+
+    def _close_journal(self) -> None:
+        if self.journal:
+            self.journal.close()
+            self.journal = None
+
+    def _open_manifest(self) -> None:
+        if self.config.manifest.enabled:
+            self.manifest = OutputManifest(Path(self.config.manifest.path), self.config)
+
+    def _close_manifest(self) -> None:
+        if self.manifest:
+            self.manifest.close()
+            self.manifest = None
+
+    async def convert_many_async(
+        self,
+        sources: Iterable[Union[Path, str, bytes, BinaryIO]],
+        output_ext: str = 'md',
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[Tuple[Any, Dict[str, Any]]]:
+        """
+        Convert PDFs without blocking the event loop, yielding results as they complete.
+
+        Sources are paths, raw PDF bytes or binary streams. Conversions run on
+        the processor's long-lived worker pool, so converters stay warm across
+        calls until close(). No output files are written.
+
+        Args:
+            concurrency: Maximum conversions in flight (default: 2x workers)
+            timeout: Per-file timeout in seconds (default: limits.timeout_per_file_sec)
+
+        Yields:
+            Tuple of (source, result_info) with result_info as returned by
+            PDFConverter.convert_pdf, including content
+        """
+        pool = self._get_shared_pool()
+        limit = concurrency or self._max_workers() * _TASKS_IN_FLIGHT_PER_WORKER
+        if timeout is None:
+            timeout = self.config.limits.timeout_per_file_sec
+
+        pending_sources = iter(sources)
+        in_flight: Set[asyncio.Task] = set()
+
+        try:
+            while True:
+                # Refill up to the concurrency limit
+                while len(in_flight) < limit:
+                    source = next(pending_sources, None)
+                    if source is None:
+                        break
+                    in_flight.add(asyncio.ensure_future(self._convert_source_async(pool, source, output_ext, timeout)))
+
+                if not in_flight:
+                    break
+
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            # The caller stopped early or was cancelled. Cancelling a task cancels
+            # its pool future through wrap_future, so conversions no worker has
+            # started yet leave the queue
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.wait(in_flight)
+
+    async def _convert_source_async(
+        self,
+        pool: SupervisedPool,
+        source: Union[Path, str, bytes, BinaryIO],
+        output_ext: str,
+        timeout: Optional[float]
+    ) -> Tuple[Any, Dict[str, Any]]:
+        """Run one conversion on the pool and turn any error into a failed result."""
+        if isinstance(source, (str, Path)):
+            payload = Path(source)
+        elif isinstance(source, bytes):
+            payload = ('document.pdf', source)
+        else:
+            # A stream may be a file or a socket; read it off the event loop
+            payload = (Path(getattr(source, 'name', 'document.pdf')).name, await asyncio.to_thread(source.read))
+
+        try:
+            future = pool.submit_with_timeout(timeout, convert_source, payload, output_ext)
+            success, result_info = await asyncio.wrap_future(future)
+        except Exception as e:
+            result_info = failed_result_info('timeout' if isinstance(e, TaskTimeoutError) else f"task_error: {str(e)}")
+
+        return source, result_info
+
+    def _get_shared_pool(self) -> SupervisedPool:
+        """Long-lived pool behind the library API, created on first use."""
+        if self._shared_pool is None:
+            self._shared_pool = self._create_pool()
+        return self._shared_pool
+
+    def close(self) -> None:
+        """Stop the workers kept warm for convert_many_async."""
+        if self._shared_pool is not None:
+            self._shared_pool.shutdown()
+            self._shared_pool = None
+
+    def _schedule_tasks(self, file_tasks: List[FileTask]) -> List[FileTask]:
+        """Order tasks by estimated cost according to logging.schedule."""
+        schedule = self.config.logging.schedule
+        if schedule == 'fifo':
+            return file_tasks
+
+        def cost(task: FileTask) -> Tuple[int, int]:
+            if task.pages is not None:
+                return task.pages, task.size
+            # Not probed: resumed, re-exported or probe disabled
+            return estimate_conversion_cost(task.input_file, task.size)
+
+        # ljf starts the most expensive files first to shorten the makespan
+        return sorted(file_tasks, key=cost, reverse=(schedule == 'ljf'))
+
+    def _process_files_parallel(self, file_tasks: Iterable[FileTask]) -> bool:
         """Process files in parallel with progress tracking."""
-        total_files = len(file_tasks)
+        # Unknown while files are still being discovered
+        total_files = len(file_tasks) if isinstance(file_tasks, list) else None
         successful = 0
         failed = 0
+        cancelled = 0
 
         # Set up progress bar
         if self.config.logging.progress and not self._cancelled:
+            from tqdm import tqdm
+
             pbar = tqdm(
                 total=total_files,
                 desc="Converting PDFs",
@@ -151,127 +666,269 @@ class PDFProcessor:
         else:
             pbar = None
 
-        try:
-            # Process with thread pool
-            with ThreadPoolExecutor(max_workers=self.config.logging.workers) as executor:
-                # Submit all tasks
-                future_to_task = {
-                    executor.submit(self._process_single_file, *task): task
-                    for task in file_tasks
-                }
-
-                # Process completed tasks
-                for future in as_completed(future_to_task):
-                    if self._cancelled:
-                        break
+        # Bound the number of submitted tasks so memory stays flat on huge runs;
+        # with batching each worker task carries docling.batch_size files
+        window = self._max_workers() * _TASKS_IN_FLIGHT_PER_WORKER * max(1, self.config.docling.batch_size)
+        queue_size = self.config.pipeline.queue_size or window
+        pending_tasks = iter(file_tasks)
+        # Files still being discovered are found off the result loop
+        discovery = _Discovery(pending_tasks, window) if total_files is None else None
+        in_flight: Dict[Future, FileTask] = {}
+        stop = False
+
+        def handle_done(future: Future) -> None:
+            nonlocal successful, failed, cancelled, stop
+            task = in_flight.pop(future)
+
+            if future.cancelled() or isinstance(future.exception(), TaskCancelledError):
+                cancelled += 1
+                self._log_cancelled(task)
+            elif self._collect_result(future, task):
+                successful += 1
+            else:
+                failed += 1
+                if self.config.logging.fail_fast and not stop:
+                    self.logger.log_error(f"Stopping on first failure: {task.input_file}")
+                    stop = True
 
-                    task = future_to_task[future]
-                    input_file, output_file, language, output_ext = task
+            # Update progress
+            if pbar:
+                pbar.update(1)
+                pbar.set_postfix({
+                    'success': successful,
+                    'failed': failed
+                })
 
-                    try:
-                        success = future.result(timeout=self.config.limits.timeout_per_file_sec)
-                        if success:
-                            successful += 1
+        cache = None
+        if self.config.cache.enabled:
+            cache = ConversionCache(Path(self.config.cache.path), self.config, self.config.cache.max_size_mb)
+
+        try:
+            with self._create_pool() as pool:
+                pipeline = ConversionPipeline(pool, self.converter, self.config, cache, hash_inputs=self.manifest is not None)
+                if self.config.logging.workers == 'auto':
+                    self._autoscaler = WorkerAutoscaler(pool, self.config.autoscale, self.logger)
+
+                while not stop and not self._cancelled:
+                    # Refill the conversion window while post-processing and
+                    # writing have room in their queue
+                    while pipeline.converting < window and len(in_flight) < window + queue_size:
+                        if discovery is None:
+                            task = next(pending_tasks, None)
                         else:
-                            failed += 1
-                            if self.config.logging.fail_fast:
-                                self.logger.log_error(f"Stopping on first failure: {input_file}")
-                                break
-
-                    except Exception as e:
-                        failed += 1
-                        self.logger.log_error(f"Task failed for {input_file}: {e}")
-
-                        # Log as failed
-                        self.logger.log_processing_result(
-                            input_file,
-                            output_file,
-                            language,
-                            {
-                                'status': 'failed',
-                                'error_reason': f"task_error: {str(e)}",
-                                'duration_ms': 0,
-                                'pages_total': 0,
-                                'pages_with_text': 0,
-                                'char_count': 0
-                            },
-                            int(input_file.stat().st_size)
-                        )
-
-                        if self.config.logging.fail_fast:
+                            # With nothing in flight, wait here for the next file found
+                            task = discovery.get(timeout=0 if in_flight else _POLL_INTERVAL_SEC)
+                        if task is None:
+                            if discovery is None or discovery.finished():
+                                # No more files to fill the last batch
+                                pipeline.flush()
                             break
+                        in_flight[self._submit_task(pipeline, task)] = task
 
-                    # Update progress
-                    if pbar:
-                        pbar.update(1)
-                        pbar.set_postfix({
-                            'success': successful,
-                            'failed': failed
-                        })
+                    if not in_flight:
+                        if discovery is None or discovery.finished():
+                            break
+                        continue
+
+                    # Process completed tasks; wake up regularly to notice shutdown
+                    # signals and, while workers have room, newly discovered files
+                    poll_interval = _POLL_INTERVAL_SEC
+                    if discovery is not None and pipeline.converting < window:
+                        poll_interval = _DISCOVERY_POLL_INTERVAL_SEC
+                    done, _ = wait(in_flight, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        handle_done(future)
+
+                    if self._autoscaler:
+                        self._autoscaler.maybe_scale()
+
+                if stop or self._cancelled:
+                    if discovery is not None:
+                        discovery.stop()
+                    self._drain(pool, pipeline, in_flight, handle_done)
+
+                    # Files never submitted are left for the next run; files
+                    # not discovered yet are found by --resume continuing the scan
+                    if discovery is not None:
+                        pending_tasks = iter(discovery.get, None)
+                    for task in pending_tasks:
+                        cancelled += 1
+                        self._log_cancelled(task)
+
+                pipeline.shutdown()
+                self.logger.add_summary_stats('pipeline', pipeline.stats())
+
+                converter_stats = pool.converter_stats()
+                if converter_stats:
+                    self.logger.add_summary_stats('converter_pool', converter_stats)
+
+                if self._engine_stats:
+                    self.logger.add_summary_stats('engines', dict(self._engine_stats))
+
+                if cache is not None:
+                    self.logger.add_summary_stats('cache', cache.stats())
 
         finally:
+            self._autoscaler = None
+            if discovery is not None:
+                discovery.stop()
+            if cache is not None:
+                cache.close()
             if pbar:
                 pbar.close()
 
+        # An interrupted run did not process every file, whatever it finished
+        if cancelled or self._cancelled:
+            return False
+
         # Return True if no failures or not in fail_fast mode
         return failed == 0 or not self.config.logging.fail_fast
 
-    def _process_single_file(
+    def _drain(
         self,
-        input_file: Path,
-        output_file: Path,
-        language: str,
-        output_ext: str
-    ) -> bool:
-        """Process a single PDF file."""
+        pool: SupervisedPool,
+        pipeline: ConversionPipeline,
+        in_flight: Dict[Future, FileTask],
+        handle_done
+    ) -> None:
+        """Cancel queued tasks and give in-flight files until limits.drain_timeout_sec to finish."""
+        pool.shutdown(wait=False, cancel_futures=True)
+        # Files buffered for a batch are cancelled by the closed pool
+        pipeline.flush()
+        deadline = time.monotonic() + self.config.limits.drain_timeout_sec
+
+        while in_flight and not self._force_stop:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            done, _ = wait(in_flight, timeout=min(remaining, _POLL_INTERVAL_SEC), return_when=FIRST_COMPLETED)
+            for future in done:
+                handle_done(future)
+
+        if in_flight:
+            # Out of time: kill the workers, their files are recorded as cancelled
+            self.logger.log_info("Drain deadline reached", in_flight=len(in_flight))
+            pool.terminate()
+            for future in list(in_flight):
+                handle_done(future)
+
+    def _log_cancelled(self, task: FileTask) -> None:
+        """Record a file that was not converted because of a shutdown."""
+        self.logger.log_cancel(task.input_file, task.output_file, task.language, task.size)
+
+        # Back to queued so that --resume picks it up
+        self._journal_finished(task, 'queued')
+
+    def _collect_result(self, future: Future, task: FileTask) -> bool:
+        """Log the outcome of a finished task and return whether it succeeded."""
         try:
-            # Convert PDF
-            success, result_info = self.converter.convert_pdf(input_file, output_ext)
-
-            # Get file size
-            file_size = int(input_file.stat().st_size)
-
-            if success:
-                # Write output file
-                content = result_info['content']
-                output_file.parent.mkdir(parents=True, exist_ok=True)
-
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(content)
-
-                # Log success
-                self.logger.log_processing_result(
-                    input_file,
-                    output_file,
-                    language,
-                    result_info,
-                    file_size
-                )
+            success, result_info = future.result()
+            return self._record_result(task, success, result_info)
 
-                return True
+        except Exception as e:
+            self.logger.log_error(f"Task failed for {task.input_file}: {e}")
 
+            # Log as failed
+            if isinstance(e, TaskTimeoutError):
+                error_reason = 'timeout'
             else:
-                # Log failure or skip
-                if result_info['status'] == 'skipped':
-                    self.logger.log_skip(
-                        input_file,
-                        output_file,
-                        language,
-                        result_info['error_reason'],
-                        file_size
-                    )
-                else:
-                    self.logger.log_processing_result(
-                        input_file,
-                        output_file,
-                        language,
-                        result_info,
-                        file_size
-                    )
+                error_reason = f"task_error: {str(e)}"
+
+            self.logger.log_processing_result(
+                task.input_file,
+                task.output_file,
+                task.language,
+                failed_result_info(error_reason),
+                task.size
+            )
+            self._journal_finished(task, 'failed', error_reason)
 
-                return False
+            return False
 
-        except Exception as e:
-            # Log unexpected error
-            self.logger.log_error(f"Unexpected error processing {input_file}: {e}")
-            return False
\ No newline at end of file
+    def _create_pool(self) -> SupervisedPool:
+        """Create the worker pool selected by logging.executor."""
+        workers = self.config.logging.workers
+        if workers == 'auto':
+            workers = self.config.autoscale.min_workers
+
+        return SupervisedPool(
+            self.config,
+            max_workers=workers,
+            executor=self.config.logging.executor,
+            task_timeout=self.config.limits.timeout_per_file_sec,
+            on_event=self.logger.log_info
+        )
+
+    def _max_workers(self) -> int:
+        """Largest number of workers this run may use."""
+        if self.config.logging.workers == 'auto':
+            return resolve_max_workers(self.config.autoscale)
+        return self.config.logging.workers
+
+    def _submit_task(self, pipeline: ConversionPipeline, task: FileTask) -> Future:
+        """Send a file down the conversion pipeline."""
+        if self.journal:
+            self.journal.mark_running(task.input_file)
+
+        document_file = None
+        if self.config.documents.enabled:
+            document_file = resolve_document_path(task.output_file, self.config.documents.dir)
+
+        return pipeline.submit(task, sibling_output_paths(task.output_file, task.output_ext), document_file)
+
+    def _record_result(
+        self,
+        task: FileTask,
+        success: bool,
+        result_info: Dict[str, Any]
+    ) -> bool:
+        """Log a conversion result returned by a worker."""
+        input_file, output_file, language = task.input_file, task.output_file, task.language
+        file_size = task.size
+
+        if self._autoscaler:
+            self._autoscaler.record_pages(result_info.get('pages_total', 0))
+
+        # Files and conversion time per engine for the summary
+        engine = result_info.get('engine')
+        if engine:
+            self._engine_stats[f"{engine}_files"] = self._engine_stats.get(f"{engine}_files", 0) + 1
+            self._engine_stats[f"{engine}_ms"] = self._engine_stats.get(f"{engine}_ms", 0) + result_info.get('duration_ms', 0)
+
+        self._journal_finished(task, result_info['status'], result_info.get('error_reason'))
+
+        if success:
+            if self.manifest:
+                self.manifest.record(sibling_output_paths(output_file, task.output_ext).values(), task)
+
+            # Log success
+            self.logger.log_processing_result(
+                input_file,
+                output_file,
+                language,
+                result_info,
+                file_size
+            )
+
+            return True
+
+        # Log failure or skip
+        if result_info['status'] == 'skipped':
+            self.logger.log_skip(
+                input_file,
+                output_file,
+                language,
+                result_info['error_reason'],
+                file_size
+            )
+        else:
+            self.logger.log_processing_result(
+                input_file,
+                output_file,
+                language,
+                result_info,
+                file_size
+            )
+
+        return False
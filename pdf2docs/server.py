@@ -0,0 +1,222 @@
+"""Long-running conversion server that keeps converters warm between requests."""
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .config import Config
+from .logger import StructuredLogger
+from .pool import SupervisedPool, TaskTimeoutError
+from .utils import validate_pdf_file
+from .workers import convert_source
+
+
+class _UnixHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer listening on a Unix domain socket."""
+
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        # HTTPServer.server_bind expects a (host, port) address
+        socketserver.TCPServer.server_bind(self)
+        self.server_name = 'localhost'
+        self.server_port = 0
+
+
+class ConversionServer:
+    """
+    Serves conversions over HTTP on a TCP port or a Unix socket.
+
+    Endpoints:
+        POST /convert  PDF bytes as the request body (X-Filename names the
+                       upload), or a JSON body {"path": "..."} for a local file;
+                       out_ext=txt|md as query parameter or JSON field
+        GET  /health   worker and queue state
+
+    Conversions run on a SupervisedPool whose workers load their converters
+    once at startup. Requests beyond server.max_concurrency running plus
+    server.max_queue waiting are turned away with 503.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.logger = StructuredLogger(config.logging)
+
+        workers = config.server.max_concurrency or config.logging.workers
+        if workers == 'auto':
+            workers = config.autoscale.min_workers
+
+        self.pool = SupervisedPool(
+            config,
+            max_workers=workers,
+            executor=config.logging.executor,
+            task_timeout=config.limits.timeout_per_file_sec,
+            on_event=self.logger.log_info
+        )
+
+        self._admission = threading.BoundedSemaphore(workers + config.server.max_queue)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._stopping = False
+
+    def serve_forever(self) -> None:
+        """Listen until SIGINT or SIGTERM, then stop the workers."""
+        self._httpd = self._create_http_server()
+        address = self.config.server.socket_path or f"{self.config.server.host}:{self.config.server.port}"
+        self.logger.log_info("Server listening", address=address, workers=self.pool.size)
+        print(f"pdf2docs server listening on {address}")
+
+        signal.signal(signal.SIGINT, self._signal_handler)
+        signal.signal(signal.SIGTERM, self._signal_handler)
+
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+            if self.config.server.socket_path:
+                Path(self.config.server.socket_path).unlink(missing_ok=True)
+            self.pool.shutdown(cancel_futures=True)
+            self.logger.log_info("Server stopped")
+
+    def convert(self, source: Any, output_ext: str) -> Tuple[HTTPStatus, Dict[str, Any]]:
+        """Convert a Path or (name, bytes) source and return the response status and body."""
+        if not self._admission.acquire(blocking=False):
+            return HTTPStatus.SERVICE_UNAVAILABLE, {'error': 'queue_full'}
+
+        with self._lock:
+            self._active += 1
+
+        try:
+            success, result_info = self.pool.submit(convert_source, source, output_ext).result()
+        except TaskTimeoutError:
+            return HTTPStatus.GATEWAY_TIMEOUT, {'status': 'failed', 'error_reason': 'timeout'}
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'status': 'failed', 'error_reason': f"task_error: {str(e)}"}
+        finally:
+            with self._lock:
+                self._active -= 1
+            self._admission.release()
+
+        return (HTTPStatus.OK if success else HTTPStatus.UNPROCESSABLE_ENTITY), result_info
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            'status': 'ok',
+            'workers': self.pool.size,
+            'active_requests': self._active,
+            'max_queue': self.config.server.max_queue
+        }
+
+    def _create_http_server(self) -> ThreadingHTTPServer:
+        handler = _make_handler(self)
+
+        socket_path = self.config.server.socket_path
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            return _UnixHTTPServer(socket_path, handler)
+
+        return ThreadingHTTPServer((self.config.server.host, self.config.server.port), handler)
+
+    def _signal_handler(self, signum, frame) -> None:
+        """Stop serving and let running conversions finish; a second signal kills them."""
+        if self._stopping:
+            print("\nSecond shutdown signal received. Stopping now...")
+            self.pool.terminate()
+            return
+
+        print("\nShutdown signal received. Finishing running conversions (signal again to stop now)...")
+        self._stopping = True
+        self._stop()
+
+    def _stop(self) -> None:
+        # shutdown() blocks until serve_forever returns, so not from its thread
+        if self._httpd is not None:
+            threading.Thread(target=self._httpd.shutdown, daemon=True).start()
+
+
+def _make_handler(server: ConversionServer):
+    """Request handler class bound to a ConversionServer."""
+
+    class ConversionRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            if urlparse(self.path).path != '/health':
+                self._send_json(HTTPStatus.NOT_FOUND, {'error': 'not_found'})
+                return
+            self._send_json(HTTPStatus.OK, server.health())
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            if url.path != '/convert':
+                self._send_json(HTTPStatus.NOT_FOUND, {'error': 'not_found'})
+                return
+
+            length = int(self.headers.get('Content-Length') or 0)
+            if length <= 0:
+                self._send_json(HTTPStatus.BAD_REQUEST, {'error': 'empty_body'})
+                return
+            if length > server.config.limits.max_file_size_mb * 1024 * 1024:
+                # The unread body makes the connection unusable for further requests
+                self.close_connection = True
+                self._send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': 'limit_exceeded'})
+                return
+            body = self.rfile.read(length)
+
+            output_ext = parse_qs(url.query).get('out_ext', ['md'])[0]
+            if self.headers.get_content_type() == 'application/json':
+                try:
+                    request = json.loads(body)
+                    source = Path(request['path'])
+                    output_ext = request.get('out_ext', output_ext)
+                except (ValueError, KeyError, TypeError):
+                    self._send_json(HTTPStatus.BAD_REQUEST, {'error': 'invalid_request'})
+                    return
+
+                is_valid, reason = validate_pdf_file(source)
+                if not is_valid:
+                    self._send_json(HTTPStatus.BAD_REQUEST, {'error': f"invalid_pdf_{reason}"})
+                    return
+            else:
+                source = (self.headers.get('X-Filename') or 'document.pdf', body)
+
+            if output_ext not in ('txt', 'md'):
+                self._send_json(HTTPStatus.BAD_REQUEST, {'error': 'invalid_out_ext'})
+                return
+
+            status, result = server.convert(source, output_ext)
+            server.logger.log_info(
+                "Request served",
+                source=str(source) if isinstance(source, Path) else source[0],
+                http_status=int(status),
+                status=result.get('status'),
+                error_reason=result.get('error_reason'),
+                duration_ms=result.get('duration_ms')
+            )
+            self._send_json(status, result)
+
+        def log_message(self, format, *args):
+            # Requests are logged as structured records instead
+            pass
+
+        def _send_json(self, status: HTTPStatus, body: Dict[str, Any]) -> None:
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            if status == HTTPStatus.SERVICE_UNAVAILABLE:
+                self.send_header('Retry-After', '1')
+            self.end_headers()
+            self.wfile.write(data)
+
+    return ConversionRequestHandler
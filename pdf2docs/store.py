@@ -0,0 +1,57 @@
+"""SQLite plumbing shared by the run journal, the output manifest and the conversion cache."""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# Commit at least this often: a crash loses little journal state, and the
+# manifest is rebuilt by reconverting anyway
+_COMMIT_EVERY_CHANGES = 200
+_COMMIT_EVERY_SEC = 1.0
+
+
+def open_database(db_path: Path, schema: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Open a database in WAL mode, creating its folder and tables if needed."""
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(str(db_path), check_same_thread=check_same_thread)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(schema)
+    conn.commit()
+    return conn
+
+
+class BatchedStore:
+    """
+    A SQLite database committed in batches.
+
+    Subclasses call _changed() after each write instead of committing, which
+    keeps the per-file overhead of a run low, and hold _lock around every use
+    of the connection.
+    """
+
+    def __init__(self, db_path: Path, schema: str):
+        self.db_path = db_path
+
+        # Used from the result loop and the discovery thread of a streaming run
+        self._conn = open_database(db_path, schema, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    def _changed(self) -> None:
+        """Commit in batches to keep per-file overhead low; called with _lock held."""
+        self._uncommitted += 1
+        now = time.monotonic()
+        if self._uncommitted >= _COMMIT_EVERY_CHANGES or now - self._last_commit >= _COMMIT_EVERY_SEC:
+            self._conn.commit()
+            self._uncommitted = 0
+            self._last_commit = now
@@ -0,0 +1,56 @@
+"""Per-file task records passed from discovery to the conversion loop."""
+
+import os
+from pathlib import Path
+from typing import Optional
+
+
+class FileTask:
+    """
+    One input file with its output and the stat result taken when it was found.
+
+    Size and modification time are captured by a single stat during discovery
+    and reused by the skip checks, the journal, the manifest and logging, so
+    the input is not stat'ed again on its way through a run. __slots__ keeps
+    each record small on runs over hundreds of thousands of files.
+
+    output_file is the output of the first format in output_ext; the others
+    sit next to it (see utils.sibling_output_paths).
+
+    content_hash is filled in by whichever step first needs the file's
+    content hash: the manifest when an input was touched, or the pipeline's
+    cache lookup or writer threads. The cache and the manifest then share it.
+
+    pages is the page count read by the text-layer probe during discovery,
+    which the ljf and sjf schedules sort on; None if the probe did not run.
+    """
+
+    __slots__ = ('input_file', 'output_file', 'language', 'output_ext', 'size', 'mtime_ns', 'content_hash', 'pages')
+
+    def __init__(
+        self,
+        input_file: Path,
+        output_file: Path,
+        language: str,
+        output_ext: str,
+        stat: Optional[os.stat_result] = None
+    ):
+        if stat is None:
+            stat = input_file.stat()
+
+        self.input_file = input_file
+        self.output_file = output_file
+        self.language = language
+        self.output_ext = output_ext
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.content_hash: Optional[str] = None
+        self.pages: Optional[int] = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Cheap input fingerprint from size and modification time."""
+        return f"{self.size}:{self.mtime_ns}"
+
+    def __repr__(self) -> str:
+        return f"FileTask({str(self.input_file)!r}, {str(self.output_file)!r}, {self.language!r}, {self.output_ext!r})"
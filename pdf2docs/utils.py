@@ -1,8 +1,9 @@
 """Utility functions for PDF2Docs CLI."""
 
 import os
+import re
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 
 def detect_language_from_path(input_path: Path) -> Optional[str]:
@@ -23,16 +24,59 @@ def detect_language_from_path(input_path: Path) -> Optional[str]:
     return None
 
 
-def resolve_output_path(input_path: Path, language: str, output_ext: str) -> Path:
+def find_language_dirs(input_path: Path) -> List[Tuple[str, Path]]:
+    """Find language subfolders of a raw data root such as data/raw."""
+    if not input_path.is_dir():
+        return []
+
+    return [
+        (child.name, child)
+        for child in sorted(input_path.iterdir())
+        if child.is_dir() and validate_language_code(child.name)
+    ]
+
+
+def resolve_output_path(
+    input_path: Path,
+    language: str,
+    output_ext: str,
+    relative_dir: Optional[Path] = None
+) -> Path:
     """Resolve output path based on input path and language."""
     # Get the filename without extension
     stem = input_path.stem
 
-    # Build output path: data/result/{language}/{filename}.{ext}
+    # Build output path: data/result/{language}/{filename}.{ext}, below the
+    # input's subfolder when a folder tree is converted recursively
     output_dir = Path("data/result") / language
+    if relative_dir is not None:
+        output_dir = output_dir / relative_dir
     return output_dir / f"{stem}.{output_ext}"
 
 
+def resolve_output_paths(
+    input_path: Path,
+    language: str,
+    output_ext: str,
+    relative_dir: Optional[Path] = None
+) -> Dict[str, Path]:
+    """Resolve the output path of every format in a comma-separated output_ext such as "txt,md"."""
+    return {ext: resolve_output_path(input_path, language, ext, relative_dir) for ext in output_ext.split(',')}
+
+
+def sibling_output_paths(output_file: Path, output_ext: str) -> Dict[str, Path]:
+    """Output path of every format in output_ext, next to the output_file of one of them."""
+    return {ext: output_file.with_suffix(f".{ext}") for ext in output_ext.split(',')}
+
+
+def resolve_document_path(output_file: Path, documents_dir: str = "") -> Path:
+    """Path of the saved DoclingDocument for an output: {dir or data/result}/{language}/{filename}.docling.json.gz."""
+    document_file = output_file.with_suffix(".docling.json.gz")
+    if not documents_dir:
+        return document_file
+    return Path(documents_dir) / document_file.relative_to("data/result")
+
+
 def ensure_directories_exist(paths: List[Path]) -> None:
     """Ensure all directories exist, create if necessary."""
     for path in paths:
@@ -47,38 +91,169 @@ def get_file_size_mb(file_path: Path) -> float:
     return file_path.stat().st_size / (1024 * 1024)
 
 
-def validate_pdf_file(file_path: Path) -> Tuple[bool, str]:
-    """Validate if file is a readable PDF."""
-    if not file_path.exists():
-        return False, "file_not_found"
+def get_rss_mb() -> float:
+    """Get resident set size of the current process in megabytes."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # No procfs: fall back to the peak RSS (kilobytes on Linux)
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def get_pdf_page_count(file_path: Union[Path, bytes]) -> Optional[int]:
+    """Read the page count from the PDF structure without converting it."""
+    try:
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(str(file_path) if isinstance(file_path, Path) else file_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    except Exception:
+        return None
+
+
+def estimate_conversion_cost(file_path: Path, size: Optional[int] = None) -> Tuple[int, int]:
+    """Estimate conversion cost as (page count, byte size); pages are 0 if unreadable."""
+    if size is None:
+        size = file_path.stat().st_size
+    return get_pdf_page_count(file_path) or 0, size
+
+
+def validate_pdf_file(file_path: Path, size: Optional[int] = None) -> Tuple[bool, str]:
+    """Validate if file is a readable PDF; a size already known from a stat saves statting it again."""
+    if size is None:
+        try:
+            size = file_path.stat().st_size
+        except OSError:
+            return False, "file_not_found"
 
     if file_path.suffix.lower() != ".pdf":
         return False, "not_pdf"
 
-    if file_path.stat().st_size == 0:
+    if size == 0:
         return False, "empty_file"
 
     return True, "valid"
 
 
-def find_pdf_files(input_path: Path, pattern: Optional[str] = None) -> List[Path]:
+def find_pdf_files(input_path: Path, pattern: Optional[str] = None, recursive: bool = False) -> List[Path]:
     """Find all PDF files in the given path matching optional pattern."""
+    return list(iter_pdf_files(input_path, pattern, recursive))
+
+
+def _glob_segment_regex(segment: str) -> str:
+    """Regex for one path segment of a glob pattern: * and ? never match a separator."""
+    regex = ''
+    i = 0
+    while i < len(segment):
+        char = segment[i]
+        i += 1
+        if char == '*':
+            regex += '[^/]*'
+        elif char == '?':
+            regex += '[^/]'
+        elif char == '[':
+            # As in fnmatch, a ] right after [ or [! belongs to the class
+            j = i
+            if segment[j:j + 1] == '!':
+                j += 1
+            if segment[j:j + 1] == ']':
+                j += 1
+            end = segment.find(']', j)
+            if end < 0:
+                regex += re.escape(char)
+                continue
+
+            # Escaped as fnmatch does, so that no character reads as a set operation
+            chars = re.sub(r'([&~|\[])', r'\\\1', segment[i:end].replace('\\', '\\\\'))
+            if chars.startswith('!'):
+                chars = '^' + chars[1:]
+            elif chars.startswith('^'):
+                chars = '\\' + chars
+            regex += f'[{chars}]'
+            i = end + 1
+        else:
+            regex += re.escape(char)
+    return regex
+
+
+def _glob_regex(pattern: str) -> re.Pattern:
+    """
+    Compile a glob pattern into a regex over '/'-separated relative paths,
+    matching what Path.glob(pattern) finds: ** stands for any number of
+    folders, including none.
+    """
+    regex = ''
+    segments = pattern.strip('/').split('/')
+    for index, segment in enumerate(segments):
+        if segment == '**':
+            # A trailing ** only matches folders, never a file
+            regex += '(?:[^/]+/)*' if index < len(segments) - 1 else '(?!)'
+        else:
+            regex += _glob_segment_regex(segment) + ('/' if index < len(segments) - 1 else '')
+    return re.compile(regex + r'\Z', re.DOTALL)
+
+
+def iter_pdf_files(
+    input_path: Path,
+    pattern: Optional[str] = None,
+    recursive: bool = False,
+    on_error: Optional[Callable[[OSError], None]] = None
+) -> Iterator[Path]:
+    """
+    Yield the PDF files in the given path matching optional pattern as they are found.
+
+    Folders are read with os.scandir, whose entries know their type, so
+    scanning does not stat every file. Subfolders are scanned depth first
+    (symlinked folders are not followed) as far as recursive or the pattern
+    requires. pattern selects the same files as input_path.glob(pattern),
+    or input_path.rglob(pattern) with recursive. Folders that cannot be read
+    are passed to on_error, if given, and skipped.
+    """
     if input_path.is_file():
         if input_path.suffix.lower() == ".pdf":
-            return [input_path]
-        return []
+            yield input_path
+        return
 
     if not input_path.is_dir():
-        return []
+        return
 
-    # Find all PDF files
-    if pattern:
-        pdf_files = list(input_path.glob(pattern))
-    else:
-        pdf_files = list(input_path.glob("*.pdf"))
+    if pattern is not None and recursive:
+        pattern = f"**/{pattern}"
 
-    # Filter to only PDF files
-    return [f for f in pdf_files if f.suffix.lower() == ".pdf"]
+    # How many folder levels below input_path can hold matches (None: any)
+    if pattern is None:
+        max_depth = None if recursive else 0
+    elif '**' in pattern:
+        max_depth = None
+    else:
+        max_depth = pattern.strip('/').count('/')
+    matcher = _glob_regex(pattern) if pattern is not None else None
+
+    pending_dirs = [(input_path, '')]
+    while pending_dirs:
+        directory, relative_dir = pending_dirs.pop()
+        descend = max_depth is None or relative_dir.count('/') < max_depth
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if descend and entry.is_dir(follow_symlinks=False):
+                        subdirs.append((Path(entry.path), f"{relative_dir}{entry.name}/"))
+                    elif entry.name.lower().endswith(".pdf") and entry.is_file():
+                        if matcher is None or matcher.match(relative_dir + entry.name):
+                            yield Path(entry.path)
+        except OSError as e:
+            if on_error is not None:
+                on_error(e)
+
+        # Visit subfolders in the order they were listed
+        pending_dirs.extend(reversed(subdirs))
 
 
 def sanitize_filename(filename: str) -> str:
@@ -154,9 +329,14 @@ def validate_language_code(lang: str) -> bool:
     return lang in ("es", "en")
 
 
-def get_skip_reason(output_path: Path, file_size_mb: float, max_size_mb: int) -> Optional[str]:
-    """Determine if file should be skipped and return reason."""
-    if output_path.exists():
+def get_skip_reason(pending_outputs: List[Path], file_size_mb: float, max_size_mb: int) -> Optional[str]:
+    """
+    Determine if file should be skipped and return reason.
+
+    pending_outputs are the outputs still to be produced, one per requested
+    format; with none left the file is already done.
+    """
+    if not pending_outputs:
         return "already_done"
 
     if file_size_mb > max_size_mb:
@@ -0,0 +1,56 @@
+"""Conversion tasks run by pool workers, and output writing."""
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from .converter import PDFConverter
+
+
+def extract_markdown(
+    converter: PDFConverter,
+    input_file: Path,
+    page_range: Optional[Tuple[int, int]] = None
+) -> Dict[str, Any]:
+    """Conversion stage of the pipeline; see PDFConverter.extract_markdown."""
+    return converter.extract_markdown(input_file, page_range)
+
+
+def extract_markdown_batch(
+    converter: PDFConverter,
+    input_files: List[Path]
+) -> List[Tuple[bool, Union[Dict[str, Any], str]]]:
+    """Batched conversion stage; see PDFConverter.extract_markdown_batch."""
+    return converter.extract_markdown_batch(input_files)
+
+
+def convert_source(
+    converter: PDFConverter,
+    source: Union[Path, Tuple[str, bytes]],
+    output_ext: str
+) -> Tuple[bool, Dict[str, Any]]:
+    """Convert a path or a (name, bytes) pair and return the content without writing it."""
+    if isinstance(source, tuple):
+        name, data = source
+        return converter.convert_bytes(name, data, output_ext)
+
+    return converter.convert_pdf(source, output_ext)
+
+
+def write_output(output_file: Path, content: str) -> None:
+    """Write converted content as UTF-8.
+
+    The content goes to a temporary file that is renamed into place, so a
+    crash never leaves a partial output that later runs would take as done.
+    """
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = output_file.with_name(f".{output_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    try:
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_file, output_file)
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
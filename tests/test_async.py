@@ -0,0 +1,43 @@
+"""convert_many_async leaves nothing running on the pool when its caller stops early."""
+
+import asyncio
+import io
+from concurrent.futures import Future
+
+from pdf2docs.config import Config
+from pdf2docs.processor import PDFProcessor
+
+
+class QueuedPool:
+    """Stands in for SupervisedPool: the first task completes, the others stay queued."""
+
+    def __init__(self):
+        self.futures = []
+
+    def submit_with_timeout(self, timeout, fn, *args):
+        future = Future()
+        if not self.futures:
+            future.set_running_or_notify_cancel()
+            future.set_result((True, {'status': 'ok', 'content': 'text'}))
+        self.futures.append(future)
+        return future
+
+
+def test_stopping_early_cancels_queued_conversions(tmp_path):
+    config = Config()
+    config.logging.log_file = str(tmp_path / 'run.log')
+    processor = PDFProcessor(config, install_signal_handlers=False)
+    pool = processor._shared_pool = QueuedPool()
+
+    async def take_first():
+        results = processor.convert_many_async([b'%PDF-1.4', io.BytesIO(b'%PDF-1.4'), b'%PDF-1.4'], concurrency=3)
+        async for _, result_info in results:
+            assert result_info['status'] == 'ok'
+            break
+        await results.aclose()
+
+        # Checked before asyncio.run cancels whatever is left at exit
+        assert len(pool.futures) == 3
+        assert all(future.cancelled() for future in pool.futures[1:])
+
+    asyncio.run(take_first())
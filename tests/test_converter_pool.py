@@ -0,0 +1,46 @@
+"""A converter held by an abandoned thread worker frees its slot."""
+
+import threading
+
+from pdf2docs.config import Config
+from pdf2docs.converter import ConverterPool
+
+
+def test_discard_frees_the_slot_of_a_stuck_thread():
+    converters = ConverterPool(Config(), size=1)
+    checked_out = threading.Event()
+    release = threading.Event()
+    held = []
+
+    def stuck():
+        with converters.checkout() as converter:
+            held.append(converter)
+            checked_out.set()
+            release.wait(5)
+
+    stuck_thread = threading.Thread(target=stuck, daemon=True)
+    stuck_thread.start()
+    assert checked_out.wait(5)
+
+    # Waits for the only instance until the stuck thread is abandoned
+    replacement = []
+
+    def waiting():
+        with converters.checkout() as converter:
+            replacement.append(converter)
+
+    waiting_thread = threading.Thread(target=waiting, daemon=True)
+    waiting_thread.start()
+    converters.discard(stuck_thread.ident)
+    waiting_thread.join(5)
+
+    assert replacement and replacement[0] is not held[0]
+
+    # The stuck call returning later does not bring the discarded instance back
+    release.set()
+    stuck_thread.join(5)
+    stats = converters.stats()
+    assert stats['instances'] == 1
+    assert stats['discarded'] == 1
+    with converters.checkout() as converter:
+        assert converter is replacement[0]
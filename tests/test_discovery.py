@@ -0,0 +1,99 @@
+"""File discovery selects what Path.glob / Path.rglob select, off the result loop."""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from pdf2docs.processor import _Discovery
+from pdf2docs.utils import find_pdf_files
+
+FILES = [
+    'a.pdf',
+    'report_1.pdf',
+    'notes.txt',
+    'sub/b.pdf',
+    'sub/report_2.pdf',
+    'sub/deep/c.pdf',
+    'sub/deep/report_3.PDF',
+    'other/[x].pdf',
+]
+
+PATTERNS = [
+    '*.pdf',
+    'report_*.pdf',
+    '**/*.pdf',
+    '**/report_*.pdf',
+    'sub/*.pdf',
+    'sub/**/*.pdf',
+    '*/deep/*.pdf',
+    'sub/?.pdf',
+    '[ab].pdf',
+    '[!a]*.pdf',
+    'other/[[]x].pdf',
+]
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for name in FILES:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'%PDF-1.4')
+    return tmp_path
+
+
+def expected(paths):
+    return sorted(path for path in paths if path.suffix.lower() == '.pdf' and path.is_file())
+
+
+@pytest.mark.parametrize('pattern', PATTERNS)
+def test_pattern_matches_glob(tree, pattern):
+    assert sorted(find_pdf_files(tree, pattern)) == expected(tree.glob(pattern))
+
+
+@pytest.mark.parametrize('pattern', PATTERNS)
+def test_recursive_pattern_matches_rglob(tree, pattern):
+    assert sorted(find_pdf_files(tree, pattern, recursive=True)) == expected(tree.rglob(pattern))
+
+
+def test_without_pattern(tree):
+    assert sorted(find_pdf_files(tree)) == [tree / 'a.pdf', tree / 'report_1.pdf']
+    assert len(find_pdf_files(tree, recursive=True)) == 7
+
+
+def test_single_file(tree):
+    assert find_pdf_files(tree / 'sub' / 'b.pdf') == [tree / 'sub' / 'b.pdf']
+    assert find_pdf_files(tree / 'notes.txt') == []
+    assert find_pdf_files(Path(tree / 'missing')) == []
+
+
+def test_slow_scan_does_not_block_the_result_loop():
+    scanned = threading.Event()
+
+    def slow_scan():
+        yield 'first'
+        scanned.wait(5)
+        yield 'second'
+
+    discovery = _Discovery(slow_scan(), maxsize=1)
+    assert discovery.get(timeout=5) == 'first'
+    assert discovery.get() is None
+    assert not discovery.finished()
+
+    scanned.set()
+    assert discovery.get(timeout=5) == 'second'
+    discovery.stop()
+    assert discovery.finished()
+
+
+def test_scan_error_is_raised_once_tasks_are_handed_over():
+    def failing_scan():
+        yield 'first'
+        raise OSError('input gone')
+
+    discovery = _Discovery(failing_scan(), maxsize=1)
+    assert discovery.get(timeout=5) == 'first'
+    discovery.stop()
+    with pytest.raises(OSError):
+        discovery.finished()
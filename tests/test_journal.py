@@ -0,0 +1,72 @@
+"""Scans journaled by streaming runs and file attempts, which --resume continues."""
+
+from pathlib import Path
+
+from pdf2docs.journal import RunJournal
+from pdf2docs.tasks import FileTask
+
+
+def test_unfinished_scan_is_resumable(tmp_path):
+    journal = RunJournal(tmp_path / 'journal.db')
+    try:
+        scan_id = journal.start_scan(Path('data/raw/en'), 'md', None, '*.pdf', True, False)
+        [scan] = journal.unfinished_scans()
+        assert scan['id'] == scan_id
+        assert scan['input_path'] == Path('data/raw/en')
+        assert scan['pattern'] == '*.pdf' and scan['recursive'] and not scan['reexport']
+
+        journal.finish_scan(scan_id)
+        assert journal.unfinished_scans() == []
+    finally:
+        journal.close()
+
+
+def test_new_scan_supersedes_unfinished_one(tmp_path):
+    journal = RunJournal(tmp_path / 'journal.db')
+    try:
+        journal.start_scan(Path('data/raw/en'), 'md', None, None, False, False)
+        journal.start_scan(Path('data/raw/es'), 'md', None, None, False, False)
+        latest = journal.start_scan(Path('data/raw/en'), 'md', None, None, False, False)
+        assert [scan['id'] for scan in journal.unfinished_scans()] == [2, latest]
+    finally:
+        journal.close()
+
+
+def test_seen_since_scan_start(tmp_path):
+    pdf_file = tmp_path / 'a.pdf'
+    pdf_file.write_bytes(b'%PDF-1.4')
+
+    journal = RunJournal(tmp_path / 'journal.db')
+    try:
+        journal.start_scan(tmp_path, 'md', 'en', None, False, False)
+        [scan] = journal.unfinished_scans()
+        assert not journal.seen_since(pdf_file, scan['started_at'])
+
+        journal.enqueue([FileTask(pdf_file, tmp_path / 'a.md', 'en', 'md')])
+        assert journal.seen_since(pdf_file, scan['started_at'])
+        assert not journal.seen_since(pdf_file, '9999')
+    finally:
+        journal.close()
+
+
+def test_cancelled_files_keep_their_attempts(tmp_path):
+    pdf_file = tmp_path / 'a.pdf'
+    pdf_file.write_bytes(b'%PDF-1.4')
+
+    journal = RunJournal(tmp_path / 'journal.db')
+    try:
+        journal.enqueue([FileTask(pdf_file, tmp_path / 'a.md', 'en', 'md')])
+        for _ in range(3):
+            # Submitted, then cancelled by a shutdown before it ran
+            journal.mark_running(pdf_file)
+            journal.mark_finished(pdf_file, 'queued')
+
+        journal.mark_running(pdf_file)
+        journal.mark_finished(pdf_file, 'failed', 'conversion_error')
+        assert [task.input_file for task in journal.unfinished(max_attempts=2)] == [pdf_file]
+
+        journal.mark_running(pdf_file)
+        journal.mark_finished(pdf_file, 'failed', 'conversion_error')
+        assert journal.unfinished(max_attempts=2) == []
+    finally:
+        journal.close()
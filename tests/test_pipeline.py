@@ -0,0 +1,170 @@
+"""Batch error, cancel, cache and saved-document paths of ConversionPipeline, without Docling."""
+
+import threading
+from concurrent.futures import Future
+import pytest
+
+from pdf2docs.cache import ConversionCache, content_hash
+from pdf2docs.config import Config
+from pdf2docs.converter import StaleDocumentError
+from pdf2docs.pipeline import ConversionPipeline
+from pdf2docs.pool import TaskCancelledError, WorkerCrashedError
+from pdf2docs.tasks import FileTask
+
+BATCH_SIZE = 3
+
+
+class StubPool:
+    """Stands in for SupervisedPool: batch tasks fail or are cancelled, or the pool is shut down or failed to start."""
+
+    task_timeout = None
+
+    def __init__(self, outcome):
+        self.outcome = outcome
+
+    def submit(self, fn, *args):
+        return self.submit_with_timeout(self.task_timeout, fn, *args)
+
+    def submit_with_timeout(self, timeout, fn, *args):
+        if self.outcome == 'shutdown':
+            raise RuntimeError('cannot submit after shutdown')
+        if self.outcome == 'failed_to_start':
+            raise WorkerCrashedError('workers fail to start')
+
+        future = Future()
+        if self.outcome == 'cancelled':
+            future.cancel()
+        else:
+            future.set_running_or_notify_cancel()
+            future.set_exception(self.outcome)
+        return future
+
+
+class StubConverter:
+    def plan_page_ranges(self, pdf_path):
+        return []
+
+    def load_parts(self, document_file, source_hash=None):
+        raise StaleDocumentError(f"{document_file} is stale")
+
+
+def make_pipeline(outcome):
+    config = Config()
+    config.docling.batch_size = BATCH_SIZE
+    return ConversionPipeline(StubPool(outcome), StubConverter(), config)
+
+
+def submit_batch(pipeline, tmp_path):
+    results = []
+    for i in range(BATCH_SIZE):
+        input_file = tmp_path / f"in{i}.pdf"
+        input_file.write_bytes(b'%PDF-1.4')
+        task = FileTask(input_file, tmp_path / f"in{i}.md", 'en', 'md')
+        results.append(pipeline.submit(task, {'md': task.output_file}))
+    pipeline.flush()
+    return results
+
+
+def test_batch_error_fails_every_file(tmp_path):
+    pipeline = make_pipeline(ValueError('convert_all exploded'))
+    try:
+        results = submit_batch(pipeline, tmp_path)
+        for result in results:
+            success, result_info = result.result(timeout=5)
+            assert not success
+            assert result_info['error_reason'] == 'convert_all exploded'
+        assert pipeline.converting == 0
+    finally:
+        pipeline.shutdown()
+
+
+@pytest.mark.parametrize('outcome', ['cancelled', 'shutdown'])
+def test_cancelled_batch_cancels_every_file(tmp_path, outcome):
+    pipeline = make_pipeline(outcome)
+    try:
+        results = submit_batch(pipeline, tmp_path)
+        for result in results:
+            assert isinstance(result.exception(timeout=5), TaskCancelledError)
+        assert pipeline.converting == 0
+    finally:
+        pipeline.shutdown()
+
+
+def test_pool_that_failed_to_start_fails_every_file(tmp_path):
+    pipeline = make_pipeline('failed_to_start')
+    try:
+        results = submit_batch(pipeline, tmp_path)
+        for result in results:
+            assert isinstance(result.exception(timeout=5), WorkerCrashedError)
+        assert pipeline.converting == 0
+    finally:
+        pipeline.shutdown()
+
+
+def make_task(tmp_path, name):
+    input_file = tmp_path / f"{name}.pdf"
+    input_file.write_bytes(b'%PDF-1.4 ' + name.encode())
+    return FileTask(input_file, tmp_path / f"{name}.md", 'en', 'md')
+
+
+def test_cache_hit_is_written_without_conversion(tmp_path):
+    config = Config()
+    cache = ConversionCache(tmp_path / 'cache.db', config, max_size_mb=10)
+    task = make_task(tmp_path, 'cached')
+    [key] = cache.keys_for(content_hash(task.input_file), ['md']).values()
+    cache.put(key, '# cached', {'status': 'ok', 'pages_total': 1})
+
+    pipeline = ConversionPipeline(StubPool(ValueError('not converted from the cache')), StubConverter(), config, cache)
+    try:
+        success, result_info = pipeline.submit(task, {'md': task.output_file}).result(timeout=5)
+        assert success and result_info['engine'] == 'cache'
+        assert task.output_file.read_text() == '# cached'
+        # Kept for the output manifest
+        assert task.content_hash == content_hash(task.input_file)
+    finally:
+        pipeline.shutdown()
+        cache.close()
+
+
+def test_flush_sends_files_still_in_cache_lookup(tmp_path):
+    config = Config()
+    config.docling.batch_size = BATCH_SIZE
+    cache = ConversionCache(tmp_path / 'cache.db', config, max_size_mb=10)
+    # Lookups are held until the flush
+    lookups_released = threading.Event()
+    cache_get = cache.get
+    cache.get = lambda key: lookups_released.wait(5) and cache_get(key)
+
+    pipeline = ConversionPipeline(StubPool(ValueError('convert_all exploded')), StubConverter(), config, cache)
+    try:
+        # Fewer files than a batch
+        results = [
+            pipeline.submit(task, {'md': task.output_file})
+            for task in (make_task(tmp_path, f"in{i}") for i in range(BATCH_SIZE - 1))
+        ]
+        pipeline.flush()
+        lookups_released.set()
+        for result in results:
+            success, result_info = result.result(timeout=5)
+            assert not success and result_info['error_reason'] == 'convert_all exploded'
+        assert pipeline.converting == 0
+    finally:
+        pipeline.shutdown()
+        cache.close()
+
+
+def test_stale_saved_document_is_converted_again(tmp_path):
+    config = Config()
+    config.docling.batch_size = BATCH_SIZE
+    task = make_task(tmp_path, 'changed')
+    document_file = tmp_path / 'changed.docling.json.gz'
+    document_file.write_bytes(b'saved from the previous contents')
+
+    pipeline = ConversionPipeline(StubPool(ValueError('converted again')), StubConverter(), config)
+    try:
+        success, result_info = pipeline.submit(task, {'md': task.output_file}, document_file).result(timeout=5)
+        assert not success and result_info['error_reason'] == 'converted again'
+        assert task.content_hash == content_hash(task.input_file)
+        assert pipeline.converting == 0
+    finally:
+        pipeline.shutdown()
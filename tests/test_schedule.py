@@ -0,0 +1,45 @@
+"""The ljf and sjf schedules sort on the page count the discovery probe read."""
+
+from pathlib import Path
+
+import pytest
+
+from pdf2docs import processor as processor_module
+from pdf2docs.config import Config
+from pdf2docs.probe import TextLayerProbe
+from pdf2docs.processor import PDFProcessor
+
+PAGES = {'short.pdf': 2, 'long.pdf': 40, 'medium.pdf': 10}
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    raw_dir = Path('data/raw/en')
+    raw_dir.mkdir(parents=True)
+    for name in PAGES:
+        (raw_dir / name).write_bytes(b'%PDF-1.4\n')
+
+    def probe(pdf_file, sample_pages):
+        return TextLayerProbe(PAGES[pdf_file.name], sample_pages, sample_pages, 100)
+
+    def reopen(*args, **kwargs):
+        raise AssertionError('PDF opened again for scheduling')
+
+    monkeypatch.setattr(processor_module, 'probe_text_layer', probe)
+    monkeypatch.setattr(processor_module, 'estimate_conversion_cost', reopen)
+
+    config = Config()
+    config.logging.log_file = str(tmp_path / 'run.log')
+    return PDFProcessor(config, install_signal_handlers=False)
+
+
+@pytest.mark.parametrize('schedule, order', [
+    ('ljf', ['long.pdf', 'medium.pdf', 'short.pdf']),
+    ('sjf', ['short.pdf', 'medium.pdf', 'long.pdf']),
+])
+def test_schedule_uses_probed_page_count(processor, schedule, order):
+    processor.config.logging.schedule = schedule
+    pdf_files = sorted(Path('data/raw/en').iterdir())
+    tasks = processor._schedule_tasks(processor._prepare_tasks(pdf_files, 'en', 'md'))
+    assert [task.input_file.name for task in tasks] == order
@@ -0,0 +1,42 @@
+"""Importing the CLI stays cheap: the conversion stack loads only when a conversion starts."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Generous for slow CI machines; importing Docling alone takes seconds
+CLI_IMPORT_BUDGET_US = 1_000_000
+
+HEAVY_MODULES = ('docling', 'tqdm', 'pdf2docs.processor')
+
+
+@pytest.fixture(scope='module')
+def import_times():
+    """Self and cumulative import time in microseconds, by module, from -X importtime."""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import pdf2docs.cli'],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        times[module.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+@pytest.mark.parametrize('heavy', HEAVY_MODULES)
+def test_cli_import_skips_conversion_stack(import_times, heavy):
+    loaded = [module for module in import_times if module == heavy or module.startswith(heavy + '.')]
+    assert loaded == []
+
+
+def test_cli_import_within_budget(import_times):
+    _, cumulative_us = import_times['pdf2docs.cli']
+    assert cumulative_us < CLI_IMPORT_BUDGET_US
@@ -0,0 +1,79 @@
+"""Each input PDF is stat'ed once per run, by discovery, and never again on its way through."""
+
+import os
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from pdf2docs.config import Config
+from pdf2docs.processor import PDFProcessor
+
+FILE_COUNT = 25
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    raw_dir = Path('data/raw/en')
+    raw_dir.mkdir(parents=True)
+    for i in range(FILE_COUNT):
+        (raw_dir / f"doc{i}.pdf").write_bytes(b'%PDF-1.4\n' + bytes(i))
+
+    config = Config()
+    # Page count and text probe open the PDF with pypdfium2, which stats it itself
+    config.limits.max_pages = 0
+    config.limits.text_probe_pages = 0
+    config.logging.log_file = str(tmp_path / 'run.log')
+
+    processor = PDFProcessor(config, install_signal_handlers=False)
+    processor._open_journal()
+    processor._open_manifest()
+    yield processor
+    processor._close_journal()
+    processor._close_manifest()
+
+
+@pytest.fixture
+def input_stats(monkeypatch):
+    """Counts os.stat calls on input PDFs, by path."""
+    counts = Counter()
+    real_stat = os.stat
+
+    def counting_stat(path, *args, **kwargs):
+        if not isinstance(path, int) and os.fspath(path).endswith('.pdf'):
+            counts[os.fspath(path)] += 1
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, 'stat', counting_stat)
+    return counts
+
+
+def discover(processor):
+    language_dirs = [('en', Path('data/raw/en'))]
+    return list(processor._discover_tasks(Path('data/raw/en'), language_dirs, 'md', None, False, False))
+
+
+def test_one_stat_per_input(processor, input_stats):
+    tasks = discover(processor)
+    assert len(tasks) == FILE_COUNT
+
+    # A successful conversion is journaled and recorded in the manifest
+    for task in tasks:
+        task.output_file.write_text('converted')
+        processor._record_result(task, True, {'status': 'ok', 'pages_total': 1, 'duration_ms': 1})
+
+    assert len(input_stats) == FILE_COUNT
+    assert set(input_stats.values()) == {1}
+
+
+def test_one_stat_per_input_when_all_done(processor, input_stats):
+    for task in discover(processor):
+        task.output_file.write_text('converted')
+        processor._record_result(task, True, {'status': 'ok', 'pages_total': 1, 'duration_ms': 1})
+    input_stats.clear()
+
+    # A rerun finds every output current and skips each file after its single stat
+    assert discover(processor) == []
+    assert len(input_stats) == FILE_COUNT
+    assert set(input_stats.values()) == {1}